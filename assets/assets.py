@@ -4,10 +4,9 @@ import mediapipe as mp
 import numpy as np
 import time
 
-# --- PARAMETERS ---
-
-# SEMAPHORES_PATH = "assets/semaphores/"
-SEMAPHORES_PATH = "assets/semaphores_randomized/"
+# SEMAPHORES_PATH (semaphore images and mapping) is set in game/vision/alphabet.py
+from game.vision.alphabet import SEMAPHORES_PATH, SemaphoreAlphabet, load_semaphores_mapping
+from game.fonts import get_font
 
 # --- Pygame setup ---
 pygame.init()
@@ -24,8 +23,8 @@ PURPLE = (180, 100, 255)
 
 # --- Fonts ---
 pygame.font.init()
-font = pygame.font.SysFont("Arial", 24)
-big_font = pygame.font.SysFont("Arial", 72)
+font = get_font("Arial", 24)
+big_font = get_font("Arial", 72)
 
 # --- Semaphores Images ---
 semaphore_images = {}
@@ -41,23 +40,10 @@ for i in range(3, 9):
 	semaphore_images[f"unused_{i}"] = pygame.image.load(f"{SEMAPHORES_PATH}unused_{i}.png").convert_alpha()
 
 # --- Semaphore Positions ---
-semaphores_mapping = {}
-with open(f"{SEMAPHORES_PATH}semaphores_mapping.txt", 'r') as f:
-	lines = f.readlines()
-	for line in lines:
-		parts = line.strip().split()
-		if len(parts) == 4:
-			letter, hand1, hand2, _ = parts
-			semaphores_mapping[(hand1, hand2)] = letter
-			semaphores_mapping[(hand2, hand1)] = letter
-with open(f"{SEMAPHORES_PATH}other_semaphores_mapping.txt", 'r') as f:
-	lines = f.readlines()
-	for line in lines:
-		parts = line.strip().split()
-		if len(parts) == 4:
-			letter, hand1, hand2, _ = parts
-			semaphores_mapping[(hand1, hand2)] = letter
-			semaphores_mapping[(hand2, hand1)] = letter
+semaphores_mapping = load_semaphores_mapping(SEMAPHORES_PATH)
+
+# Compiled alphabet: octant table, reverse index and overlay geometry
+semaphore_alphabet = SemaphoreAlphabet(semaphores_mapping)
 
 # --- Bonus Icons ---
 life_images = []
@@ -0,0 +1,257 @@
+"""Per stage benchmark of the webcam recognition path, headless (SDL dummy video driver).
+
+Each stage of WebcamPanel's path is timed separately on every frame: capture, flip, color conversion
+(downscale + BGR->RGB), inference, landmark extraction, classification, overlay drawing and surface
+conversion (resize into the display buffer + blit). Reports p50 / p95 / p99 latency and throughput,
+--output also writes them as JSON to compare builds.
+
+    python benchmark.py                                           # synthetic frames and landmarks
+    python benchmark.py --source video --path clip.mp4            # recorded frames
+    python benchmark.py --source images --path frames/
+    python benchmark.py --source landmarks --path landmarks.bin   # recorded landmarks, no inference stage
+    python benchmark.py --backend holistic --frames 500 --output results.json
+
+With the camera, the capture stage includes the wait for the next frame (a new frame is only delivered at
+the camera rate), the other stages never process the same frame twice.
+
+With synthetic input, the inference runs on a noise frame (no player found) and the stages after it use
+synthetic landmarks of a player going through the alphabet.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import cv2
+import mediapipe as mp
+import numpy as np
+
+# The assets need a display mode to be set before they are loaded (same as main.py)
+SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720
+screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+from assets.assets import semaphore_alphabet
+from game.UI.webcam_section import WebcamPanel
+from game.logger import WebcamLogger
+from game.vision.sources import create_source
+from game.vision.backends import player_landmarks
+from game.vision.landmarks import get_tracked_points, get_confidence
+from game.vision.classification import classify_octants
+
+STAGES = (
+    'capture', 'flip', 'color_conversion', 'inference', 'landmark_extraction',
+    'classification', 'overlays', 'surface_conversion',
+)
+
+# Same webcam panel rect as main.py
+PANEL_RECT = pygame.Rect(SCREEN_HEIGHT, SCREEN_HEIGHT // 2, SCREEN_WIDTH - SCREEN_HEIGHT, SCREEN_HEIGHT // 2)
+
+
+class SyntheticSource:
+    """Noise frames at 30 fps (same read() / release() interface as the other frame sources)"""
+
+    def __init__(self, width=640, height=480, fps=30.0, seed=0):
+        self.frame = np.random.default_rng(seed).integers(0, 256, (height, width, 3), dtype=np.uint8)
+        self.fps = fps
+        self.seq = 0
+        self.dropped_frames = 0
+
+    def read(self):
+        self.seq += 1
+        return self.frame, self.seq / self.fps, self.seq
+
+    def release(self):
+        pass
+
+
+class SyntheticPlayer:
+    """Holds every letter of the alphabet for `frames_per_letter` frames"""
+
+    def __init__(self, frames_per_letter=15, seed=0):
+        self.octants = [octants for symbol, octants in sorted(semaphore_alphabet.octants.items()) if len(symbol) == 1]
+        self.frames_per_letter = frames_per_letter
+        self.rng = np.random.default_rng(seed)
+
+    def landmarks(self, frame_index, image_width, image_height):
+        right, left = self.octants[(frame_index // self.frames_per_letter) % len(self.octants)]
+        return player_landmarks(right, left, image_width / image_height, angle_noise=5.0, rng=self.rng)
+
+
+def percentiles(samples):
+    samples = np.asarray(samples) * 1000.0
+    mean = samples.mean()
+    return {
+        'p50_ms': float(np.percentile(samples, 50)),
+        'p95_ms': float(np.percentile(samples, 95)),
+        'p99_ms': float(np.percentile(samples, 99)),
+        'mean_ms': float(mean),
+        'throughput_fps': float(1000.0 / mean) if mean > 0 else None,
+    }
+
+
+def run(args):
+    if args.source == "synthetic":
+        source = SyntheticSource()
+    elif args.source == "camera":
+        source = create_source("camera")
+    elif args.source == "images":
+        source = create_source("images", directory=args.path, realtime=False, loop=True)
+    else:
+        source = create_source(args.source, path=args.path, realtime=False, loop=True)
+    synthetic_player = SyntheticPlayer() if args.source == "synthetic" else None
+
+    panel = WebcamPanel(
+        PANEL_RECT, WebcamLogger(os.devnull), source=source, backend=args.backend,
+        backend_params=json.loads(args.backend_params), use_stabilizer=args.stabilizer,
+    )
+    stabilizer = panel.stabilizer
+    timings = {stage: [] for stage in STAGES}
+    totals = []
+
+    frame_index = 0
+    last_seq = None
+    while frame_index < args.warmup + args.frames:
+        stage_times = {}
+        start = time.perf_counter()
+        frame, timestamp, seq = source.read()
+        # read() doesn't block: a live camera returns its latest frame again until the next one arrives.
+        # Waits for a new frame, the wait is part of the capture stage
+        while frame is None or seq == last_seq:
+            if time.perf_counter() - start > 5.0:
+                raise RuntimeError(f"No new frame from the '{args.source}' source")
+            time.sleep(0.001)
+            frame, timestamp, seq = source.read()
+        last_seq = seq
+        t1 = time.perf_counter()
+        stage_times['capture'] = t1 - start
+
+        if not panel.landmark_replay:
+            frame = cv2.flip(frame, 1)
+            t0, t1 = t1, time.perf_counter()
+            stage_times['flip'] = t1 - t0
+        image_height, image_width = frame.shape[:2]
+
+        if panel.landmark_replay:
+            landmarks, _, _ = source.read_landmarks()
+            confidence = get_confidence(landmarks)
+            t1 = time.perf_counter()
+        else:
+            # downscale + BGR -> RGB, like game/vision/roi.py process_bgr
+            rgb_frame = frame
+            if args.inference_size and max(image_width, image_height) > args.inference_size:
+                scale = args.inference_size / max(image_width, image_height)
+                rgb_frame = cv2.resize(frame, (int(image_width * scale), int(image_height * scale)),
+                                       interpolation=cv2.INTER_AREA)
+            rgb_frame = cv2.cvtColor(rgb_frame, cv2.COLOR_BGR2RGB)
+            rgb_frame.flags.writeable = False
+            t0, t1 = t1, time.perf_counter()
+            stage_times['color_conversion'] = t1 - t0
+
+            landmarks, confidence = panel.backend.detect(rgb_frame)
+            t0, t1 = t1, time.perf_counter()
+            stage_times['inference'] = t1 - t0
+        if synthetic_player:
+            landmarks = synthetic_player.landmarks(frame_index, image_width, image_height)
+            confidence = get_confidence(landmarks)
+            t1 = time.perf_counter()  # (not part of any stage)
+
+        points = get_tracked_points(landmarks, image_width, image_height)
+        t0, t1 = t1, time.perf_counter()
+        stage_times['landmark_extraction'] = t1 - t0
+
+        if stabilizer:
+            octants, symbol = stabilizer.update(points)
+        else:
+            octants = classify_octants(points)
+            symbol = semaphore_alphabet.lookup(octants)
+        t0, t1 = t1, time.perf_counter()
+        stage_times['classification'] = t1 - t0
+
+        # WebcamPanel.draw, timed without then with the overlays (drawn on the display buffer after the blit
+        # here, which doesn't change their cost)
+        panel.frame_seq = seq
+        panel.landmarks = landmarks
+        panel.landmarks_confidence = confidence
+        panel.tracked_points = points / (image_width, image_height)
+        panel.octants = octants
+        panel.detected_semaphore = symbol
+        panel.show_overlays = False
+        panel.draw(screen, frame)  # resize into the display buffer + blit
+        t0, t1 = t1, time.perf_counter()
+        stage_times['surface_conversion'] = t1 - t0
+
+        panel.draw_overlays(panel.display_buffer)
+        t0, t1 = t1, time.perf_counter()
+        stage_times['overlays'] = t1 - t0
+
+        if frame_index >= args.warmup:
+            for stage, duration in stage_times.items():
+                timings[stage].append(duration)
+            totals.append(sum(stage_times.values()))
+        frame_index += 1
+
+    vision_stats = panel.vision_stats()
+    panel.close()
+
+    results = {
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'config': {
+            'source': args.source, 'path': args.path, 'backend': args.backend,
+            'backend_params': json.loads(args.backend_params), 'inference_size': args.inference_size,
+            'stabilizer': args.stabilizer, 'frames': args.frames, 'warmup': args.warmup,
+        },
+        'environment': {
+            'python': platform.python_version(), 'platform': platform.platform(), 'processor': platform.processor(),
+            'opencv': cv2.__version__, 'mediapipe': mp.__version__, 'pygame': pygame.version.ver,
+        },
+        'stages': {stage: percentiles(samples) for stage, samples in timings.items() if samples},
+        'total': percentiles(totals),
+        'vision_stats': vision_stats,
+    }
+    return results
+
+
+def print_results(results):
+    print(f"\n{'stage':22s}{'p50 ms':>10s}{'p95 ms':>10s}{'p99 ms':>10s}{'fps':>10s}")
+    print("-" * 62)
+    for stage, stats in list(results['stages'].items()) + [('total', results['total'])]:
+        print(f"{stage:22s}{stats['p50_ms']:10.3f}{stats['p95_ms']:10.3f}{stats['p99_ms']:10.3f}"
+              f"{stats['throughput_fps']:10.1f}")
+    print()
+    for key, value in results['vision_stats'].items():
+        print(f"{key:22s}{value:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per stage benchmark of the webcam recognition path")
+    parser.add_argument('--source', default="synthetic", choices=("synthetic", "camera", "video", "images", "landmarks"))
+    parser.add_argument('--path', help="video file, image directory or landmark recording")
+    parser.add_argument('--backend', default="pose_hands")
+    parser.add_argument('--backend-params', default="{}", help="JSON, e.g. '{\"pose_model_complexity\": 0}'")
+    parser.add_argument('--inference-size', type=int, default=480, help="longest side of the inference image")
+    parser.add_argument('--stabilizer', action='store_true', help="classify with the SemaphoreStabilizer")
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--output', help="JSON results file")
+    args = parser.parse_args()
+    if args.source in ("video", "images", "landmarks") and not args.path:
+        parser.error(f"--source {args.source} needs --path")
+
+    results = run(args)
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -25,6 +25,7 @@ class BonusBar:
         # --- Style ---
         self.color_bg = GRAY
         self.color_fill = GREEN
+        self.drawn_fill_width = None  # fill width last drawn (see draw_dirty)
 
     def update_semaphore_detected(self, new_semaphore_detected):
         """Adjusts speed mode based on detected semaphore."""
@@ -54,9 +55,19 @@ class BonusBar:
             # Reset
             self.progress = 0.0
 
+    def draw_dirty(self, surface, force=False):
+        """draw() for the dirty rectangle rendering (see game/UI/compositor.py): only redraws when the fill
+        changed, returns the changed screen rects
+        """
+        if not force and int(self.rect.width * self.progress) == self.drawn_fill_width:
+            return []
+        self.draw(surface)
+        return [self.rect]
+
     def draw(self, surface):
         pygame.draw.rect(surface, self.color_bg, self.rect)
         fill_width = int(self.rect.width * self.progress)
+        self.drawn_fill_width = fill_width
         pygame.draw.rect(
             surface, self.color_fill,
             (self.rect.x, self.rect.y, fill_width, self.rect.height)
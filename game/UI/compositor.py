@@ -0,0 +1,40 @@
+import pygame
+
+from assets.assets import BLACK
+
+
+class DirtyRectCompositor:
+    """Dirty rectangle rendering (opt-in): instead of clearing the screen, redrawing every panel and flipping
+    the whole display, each panel redraws itself only if it changed and reports the screen rects it changed,
+    and only those are sent to the display with pygame.display.update(rects).
+
+    The panels are given as draw functions (surface, force) -> list of changed rects, in drawing order (see the
+    panels' draw_dirty methods). force=True redraws everything: first frame, or after invalidate().
+    """
+
+    def __init__(self, screen, background=BLACK):
+        self.screen = screen
+        self.background = background
+        self.full_redraw = True
+
+    def invalidate(self):
+        """Redraws and sends the whole screen on the next render (e.g. the window was exposed)"""
+        self.full_redraw = True
+
+    def render(self, draw_functions):
+        """Draws the panels and updates the display. Returns the rects that were sent to the display"""
+        force = self.full_redraw
+        if force:
+            self.screen.fill(self.background)
+
+        changed_rects = []
+        for draw in draw_functions:
+            changed_rects.extend(draw(self.screen, force))
+
+        if force:
+            pygame.display.flip()
+            self.full_redraw = False
+            return [self.screen.get_rect()]
+        if changed_rects:
+            pygame.display.update(changed_rects)
+        return changed_rects
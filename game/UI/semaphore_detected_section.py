@@ -6,6 +6,7 @@ import time
 import math
 
 from assets.assets import WHITE, GREEN, GRAY, PURPLE, big_font, semaphore_images
+from game.fonts import render_text
 
 # Custom event type for progress completion
 SEMAPHORE_COMPLETE_EVENT = pygame.USEREVENT + 1
@@ -24,6 +25,8 @@ class SemaphorePanel:
         # Timing (0.5 seconds to full progress)
         self.progress_duration = 0.5
 
+        self.drawn_state = None  # (semaphore, progress) last drawn (see draw_dirty)
+
     def update_semaphore_detected(self, new_semaphore_detected):
         """Called by main when a new semaphore letter is detected."""
         if new_semaphore_detected != self.semaphore_detected:
@@ -57,7 +60,17 @@ class SemaphorePanel:
             if not self.completed:
                 self.progress = 0.0
 
+    def draw_dirty(self, surface, force=False):
+        """draw() for the dirty rectangle rendering (see game/UI/compositor.py): only redraws when the
+        semaphore or the progress changed, returns the changed screen rects
+        """
+        if not force and (self.semaphore_detected, self.progress) == self.drawn_state:
+            return []
+        self.draw(surface)
+        return [self.rect]
+
     def draw(self, surface):
+        self.drawn_state = (self.semaphore_detected, self.progress)
         pygame.draw.rect(surface, GRAY, self.rect)
         x, y, w, h = self.rect
 
@@ -109,7 +122,7 @@ class SemaphorePanel:
         else:
             display_symbol = "-"
 
-        letter_surface = big_font.render(display_symbol, True, WHITE)
+        letter_surface = render_text(display_symbol, big_font, WHITE)
         letter_rect = letter_surface.get_rect(center=letter_area_center)
         surface.blit(letter_surface, letter_rect)
 
@@ -5,6 +5,7 @@ import numpy as np
 import time
 
 from assets.assets import GRAY, WHITE, PINK, BLUE, PURPLE, font, semaphore_images, life_images, bomb_images
+from game.fonts import render_text
 
 GAMEOVER_EVENT = pygame.USEREVENT + 2
 
@@ -39,10 +40,16 @@ class StatusPanel:
             life_images[i] = get_scaled(life_images[i], self.line_height)
         for i in range(len(bomb_images)):
             bomb_images[i] = get_scaled(bomb_images[i], self.line_height)
+        self.bomb_semaphore_image = get_scaled(semaphore_images["BOMB"], self.line_height)
+
+        # --- cached panel surface, redrawn only after a state change (the mutators set dirty) ---
+        self.panel_surface = pygame.Surface(self.rect.size).convert()
+        self.dirty = True
 
     def take_damage(self):
         """Removes one full life if available."""
         self.lives -= 1
+        self.dirty = True
         # logging
         self.gameplay_logger.lives_updated(self.lives, self.life_fragments)
         if self.lives <= 0:
@@ -58,6 +65,7 @@ class StatusPanel:
         self.lives = min(self.lives, self.life_slots)
         if self.lives == self.life_slots:
             self.life_fragments = 0  # can't store fragments if at max lives
+        self.dirty = True
         # logging
         self.gameplay_logger.lives_updated(self.lives, self.life_fragments)
         
@@ -71,6 +79,7 @@ class StatusPanel:
             sucess = True
             self.bombs -= number
         self.bombs = max(self.bombs, 0)
+        self.dirty = True
         # logging
         self.gameplay_logger.bombs_updated(self.bombs, self.bomb_fragments)
         return sucess
@@ -85,26 +94,45 @@ class StatusPanel:
         self.bombs = min(self.bombs, self.bomb_slots)
         if self.bombs == self.bomb_slots:
             self.bomb_fragments = 0  # can't store fragments if at max bombs
+        self.dirty = True
         # logging
         self.gameplay_logger.bombs_updated(self.bombs, self.bomb_fragments)
 
     def gain_score(self, number):
         self.score += number
+        self.dirty = True
         # logging
         self.gameplay_logger.score_updated(self.score)
 
+    def draw_dirty(self, surface, force=False):
+        """draw() for the dirty rectangle rendering (see game/UI/compositor.py): only redraws when the score,
+        lives or bombs changed, returns the changed screen rects
+        """
+        if not (force or self.dirty):
+            return []
+        self.draw(surface)
+        return [self.rect]
+
     def draw(self, surface):
-        pygame.draw.rect(surface, GRAY, self.rect)
-        x, y = self.rect.topleft
+        if self.dirty:
+            self.render_panel()
+            self.dirty = False
+        surface.blit(self.panel_surface, self.rect.topleft)
+
+    def render_panel(self):
+        """Draws the panel into the cached panel surface"""
+        surface = self.panel_surface
+        surface.fill(GRAY)
+        x, y = 0, 0
 
         # --- 1. Score (white) ---
         score_y = y + self.spacing
-        score_text = font.render(f"Score : {self.score:06d}", True, WHITE)
+        score_text = render_text(f"Score : {self.score:06d}", font, WHITE)
         surface.blit(score_text, (x + self.margin_left, score_y))
 
         # --- 2. Lives (pink + icons) ---
         lives_y = score_y + self.line_height + self.spacing
-        lives_text = font.render("Lives :", True, PINK)
+        lives_text = render_text("Lives :", font, PINK)
         surface.blit(lives_text, (x + self.margin_left, lives_y))
 
         # Draw 8 life slots
@@ -125,7 +153,7 @@ class StatusPanel:
 
         # --- 3. Bombs (blue + icons + semaphore image) ---
         bombs_y = lives_y + self.line_height + self.spacing
-        bombs_text = font.render("Bombs :", True, BLUE)
+        bombs_text = render_text("Bombs :", font, BLUE)
         surface.blit(bombs_text, (x + self.margin_left, bombs_y))
 
         icon_x = x + 120
@@ -143,7 +171,7 @@ class StatusPanel:
         # Semaphore hint image at end of bombs row
         sema_x = icon_x + self.bomb_slots * (bomb_images[0].get_width() + self.spacing) + self.margin_left
         sema_y = bombs_y - 5
-        scaled_img = get_scaled(semaphore_images["BOMB"], self.line_height)
+        scaled_img = self.bomb_semaphore_image
 
         # Draw outline
         outline_rect = pygame.Rect(
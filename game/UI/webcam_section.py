@@ -4,17 +4,34 @@ import mediapipe as mp
 import numpy as np
 import time
 import math
+import inspect
 
-from assets.assets import semaphores_mapping
+from assets.assets import semaphores_mapping, semaphore_alphabet
+from game.vision.sources import create_source
+from game.vision.recording import LandmarkRecorder
+from game.vision.backends import BACKENDS, create_backend
+from game.vision.markers import (
+    CALIBRATION_BOXES, MARKER_CALIBRATION_PATH, calibrate_markers, save_marker_calibration
+)
+from game.vision.inference_worker import InferenceWorker
+from game.vision.roi import RoiTracker, process_bgr
+from game.vision.motion_model import HandMotionModel
+from game.vision.motion_gate import MotionGate
+from game.vision.quality import (
+    INFERENCE_QUALITY_LEVELS, OVERLAY_QUALITY_LEVELS, QualityController, inference_settings
+)
+from game.vision.stabilizer import SemaphoreStabilizer
+from game.vision.overlay import OctantMaskCache
+from game.vision.landmarks import (
+    POSE_ROWS, LEFT_HAND_ROWS, RIGHT_HAND_ROWS, BODY_CENTER, RIGHT_HAND, LEFT_HAND,
+    empty_landmarks, is_detected, get_tracked_points, get_confidence, point_to_tuple, draw_landmarks
+)
+from game.vision.classification import classify_octants, get_hand_positions, OCTANT_WIDTH
 
 # --- Mediapipe setup ---
 mp_holistic = mp.solutions.holistic
-mp_drawing = mp.solutions.drawing_utils
 mp_pose = mp.solutions.pose
 
-# --- Webcam setup ---
-cap = cv2.VideoCapture(0)
-
 # Semaphore Definitions
 # Right hand, Left hand
 SEMAPHORE_LETTERS = semaphores_mapping
@@ -86,182 +103,168 @@ SEMAPHORE_LETTERS = semaphores_mapping
 #     ('High_Left', 'High_Left'): 'unused_8',
 # }
 
+# Octant boundary lines (offsets from the body center), computed once
+GUIDELINE_ANGLES = np.radians(np.arange(8) * OCTANT_WIDTH + OCTANT_WIDTH / 2)
+GUIDELINE_OFFSETS = (1000 * np.stack([np.cos(GUIDELINE_ANGLES), np.sin(GUIDELINE_ANGLES)], axis=1)).astype(int)
+
+# Cached octant masks for the filled octants
+octant_masks = OctantMaskCache(semaphore_alphabet)
+
 # Helper Functions
-def calculate_angle(point1, point2):
-    """Calculates angle between two points (origin: point1) in degrees"""
-    if not (isinstance(point1, (tuple, list)) and isinstance(point2, (tuple, list))):
-        return 0
-    angle = math.degrees(math.atan2(point2[1] - point1[1], point2[0] - point1[0]))
-    return angle
-
-def get_palm_top_coords(hand_landmarks, image_width, image_height):
-    """Calculates the center of palm"""
-    mcp_ids = [
-        mp_holistic.HandLandmark.INDEX_FINGER_MCP, mp_holistic.HandLandmark.MIDDLE_FINGER_MCP,
-        mp_holistic.HandLandmark.RING_FINGER_MCP, mp_holistic.HandLandmark.PINKY_MCP,
-    ]
-    xs = [hand_landmarks.landmark[lm_id].x * image_width for lm_id in mcp_ids]
-    ys = [hand_landmarks.landmark[lm_id].y * image_height for lm_id in mcp_ids]
-    if not xs: return None
-    return (int(sum(xs) / len(xs)), int(sum(ys) / len(ys)))
-
-def get_hand_position(angle):
-    if -22.5 <= angle <= 22.5: return 'Right'
-    elif 22.5 < angle <= 67.5: return 'Low_Right'
-    elif 67.5 < angle <= 112.5: return 'Down'
-    elif 112.5 < angle <= 157.5: return 'Low_Left'
-    elif 157.5 < angle <= 180 or -180 <= angle <= -157.5: return 'Left'
-    elif -157.5 < angle <= -112.5: return 'High_Left'
-    elif -112.5 < angle <= -67.5: return 'Up'
-    elif -67.5 < angle < -22.5: return 'High_Right'
-    return None
-
-def get_position_angle(position):
-    """Get the angle (degrees) for a hand position"""
-    position_angles = {'Right': 0, 'Low_Right': 45, 'Down': 90, 'Low_Left': 135,
-                       'Left': 180, 'High_Left': -135, 'Up': -90, 'High_Right': -45}
-    return position_angles.get(position, 0)
-
-def draw_filled_octant(frame, body_center, position, color, alpha=0.3, image_width=640, image_height=480):
+def draw_filled_octant(frame, body_center, octant, color, alpha=0.3):
     if not body_center:
         return
-    
-    center_angle = get_position_angle(position)
-    
-    start_angle = center_angle - 22.5
-    end_angle = center_angle + 22.5
-    
-    radius = int(math.sqrt(image_width**2 + image_height**2))
-    overlay = frame.copy()
-    points = [body_center]
-    num_points = 20
-    for i in range(num_points + 1):
-        angle = start_angle + (end_angle - start_angle) * i / num_points
-        angle_rad = math.radians(angle)
-        x = int(body_center[0] + radius * math.cos(angle_rad))
-        y = int(body_center[1] + radius * math.sin(angle_rad))
-        points.append((x, y))
-    
-    points = np.array(points, dtype=np.int32)
-    cv2.fillPoly(overlay, [points], color)
-    cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0, frame)
+    octant_masks.blend(frame, body_center, octant, color, alpha)
 
-def draw_guide_lines(frame, body_center, detected_letter, image_width, image_height):
+def draw_guide_lines(frame, body_center, detected_letter):
     """Draws filled octants showing optimal hand positions."""
     if not body_center or not detected_letter: return
     
-    target_positions = next(((rh, lh) for (rh, lh), letter in SEMAPHORE_LETTERS.items() if letter == detected_letter), None)
-    if not target_positions: return
+    target_octants = semaphore_alphabet.get_octants(detected_letter)
+    if not target_octants: return
     
     # Draw filled octants for target positions
     colors = [(255, 0, 255), (255, 150, 255)]
     
-    for i, (hand, target_pos) in enumerate(zip(["R", "L"], target_positions)):
-        draw_filled_octant(frame, body_center, target_pos, colors[i], alpha=0.15, 
-                          image_width=image_width, image_height=image_height)
-
-def draw_additional_guidelines(frame, body_center):
-    for angle in range(-180, 180, 45):
-        line_length = 1000
-        angle_rad = math.radians(angle + 22.5)
-        end_x = int(body_center[0] + line_length * math.cos(angle_rad))
-        end_y = int(body_center[1] + line_length * math.sin(angle_rad))
-        cv2.line(frame, body_center, (end_x, end_y), (255, 255, 255), 2)
+    for color, target_octant in zip(colors, target_octants):
+        draw_filled_octant(frame, body_center, target_octant, color, alpha=0.15)
+
+def draw_additional_guidelines(frame, body_center, thickness=2):
+    for end in (GUIDELINE_OFFSETS + body_center).tolist():
+        cv2.line(frame, body_center, end, (255, 255, 255), thickness)
 
 class WebcamPanel:
-    def __init__(self, rect, webcam_logger):
+    def __init__(self, rect, webcam_logger, backend="holistic", backend_params=None, use_inference_process=False,
+                 use_roi_tracking=False, roi_params=None, use_motion_model=False, motion_params=None,
+                 show_overlays=True, source="camera", source_params=None, record_landmarks=None,
+                 use_stabilizer=False, stabilizer_params=None, use_motion_gate=False, motion_gate_params=None,
+                 use_quality_controller=False, quality_params=None):
         self.rect = rect
-        self.holistic = mp_holistic.Holistic(min_detection_confidence=0.5, min_tracking_confidence=0.5)
         self.webcam_logger = webcam_logger
 
+        # --- Frame source: "camera" (read on a background thread), "video" or "images" (recorded frames),
+        # "landmarks" (replays a landmark recording, no inference), see game/vision/sources.py.
+        # An already opened source can also be passed ---
+        self.capture = create_source(source, **(source_params or {})) if isinstance(source, str) else source
+        self.frame = None  # last (mirrored) frame, returned again until the source delivers a new one
+        self.frame_timestamp = 0.0
+        self.frame_seq = 0
+        self.landmark_replay = getattr(self.capture, 'provides_landmarks', False)
+        if hasattr(self.capture, 'granted'):
+            self.log_camera_configuration()
+
+        # record_landmarks: file path, saves the landmarks of every frame (see game/vision/recording.py)
+        self.landmark_recorder = LandmarkRecorder(record_landmarks) if record_landmarks else None
+
+        # --- Landmark inference (in this process, or in a worker process on another core) ---
+        # backend: "holistic" (full model), "pose_hands" (no face mesh, cheaper), "pose" (wrists only),
+        # "replay" (landmark recording), "mock" (scripted / keyboard player, no model) or "markers" (coloured
+        # flags or gloves, no model), see game/vision/backends.py
+        # use_roi_tracking: only run the inference on a crop around the player (see game/vision/roi.py)
+        self.backend_name = backend
+        self.backend_params = backend_params or {}
+        self.failed_backend_params = []  # parameters the backend could not be created with, not tried again
+        self.backend = None
+        self.roi_tracker = None
+        self.inference_worker = None
+        roi_params = (roi_params or {}) if use_roi_tracking else None
+        if backend in BACKENDS and not BACKENDS[backend].SUPPORTS_ROI:
+            roi_params = None
+        if backend in BACKENDS and use_inference_process:
+            game_process_params = [name for name in BACKENDS[backend].GAME_PROCESS_PARAMS if self.backend_params.get(name)]
+            if game_process_params:
+                print(f"The {backend} backend runs in the game process with {', '.join(game_process_params)}.")
+                use_inference_process = False
+        if self.landmark_replay:
+            pass  # no model to load
+        elif use_inference_process:
+            self.inference_worker = InferenceWorker(backend, backend_params, roi_params)
+        else:
+            self.backend = create_backend(backend, **(backend_params or {}))
+            if roi_params is not None:
+                self.roi_tracker = RoiTracker(**roi_params)
+
+        # --- Reduced inference rate, hands predicted in between (see game/vision/motion_model.py) ---
+        self.motion_model = HandMotionModel(**(motion_params or {})) if use_motion_model else None
+        self.landmarks = empty_landmarks()
+        self.landmarks_timestamp = 0.0
+        self.landmarks_confidence = 0.0  # detection confidence of the landmarks (see RecognitionBackend.detect)
+
+        # --- No inference when the frame didn't change (see game/vision/motion_gate.py) ---
+        self.motion_gate = MotionGate(**(motion_gate_params or {})) if use_motion_gate else None
+
+        # --- Symbol only changes once stable (hysteresis + vote, see game/vision/stabilizer.py) ---
+        self.stabilizer = SemaphoreStabilizer(semaphore_alphabet, **(stabilizer_params or {})) if use_stabilizer else None
+
+        # --- Vision quality adapted to the measured times (see game/vision/quality.py): the inference settings
+        # follow the inference time (measured where it runs), the overlays follow the game loop time.
+        # quality_params: target_inference_time, target_frame_time and the QualityController parameters ---
+        self.inference_quality = None
+        self.overlay_quality = None
+        if use_quality_controller:
+            quality_params = dict(quality_params or {})
+            target_inference_time = quality_params.pop('target_inference_time', 1 / 30)
+            target_frame_time = quality_params.pop('target_frame_time', 1 / 60)
+            self.inference_quality = QualityController(INFERENCE_QUALITY_LEVELS, target_inference_time, **quality_params)
+            self.overlay_quality = QualityController(OVERLAY_QUALITY_LEVELS, target_frame_time, **quality_params)
+            self.configured_inference_settings = self.get_inference_settings(roi_params)
+        self.overlay_detail = "full"
+
+        # --- Colour marker calibration (see calibrate_markers) ---
+        self.calibration_deadline = None  # time the calibration frame is taken, None when not calibrating
+
         # for logging purposes
         self.valid_landmarks_flag = False
         self.last_detected_semaphore = "None"
         
-        # Store hand coordinates for debug visualization
-        self.debug_right_hand_coords = None
-        self.debug_left_hand_coords = None
-        self.debug_body_center = None
+        # Vision results of the last update, drawn over the webcam image (at display resolution) by draw()
+        self.show_overlays = show_overlays
+        self.tracked_points = np.full((3, 2), np.nan)  # normalized to the frame size
+        self.octants = np.array([-1, -1])
+        self.detected_semaphore = "NONE"
+
+        # Display buffer: the frame is resized straight into it and the surface shares its memory
+        # (BGR channel order, no color conversion / rotation / flip before the blit)
+        self.display_buffer = None
+        self.display_surface = None
+        self.display_key = None  # (frame seq, width, height, overlays, detail) of the image in the display buffer
+        self.display_rect = None  # screen rect the display surface was blitted to
 
     def update(self):
-        ret, frame = cap.read()
-        if not ret:
+        frame, frame_timestamp, frame_seq = self.capture.read()
+        if frame is None:
             return None, "NONE"
+        if frame_seq == self.frame_seq and self.frame is not None:
+            return self.frame, self.detected_semaphore  # same frame as the last update: nothing to recompute
+        self.frame_timestamp, self.frame_seq = frame_timestamp, frame_seq
         
-        frame = cv2.flip(frame, 1)
+        if not self.landmark_replay:
+            frame = cv2.flip(frame, 1)  # (replayed landmarks were recorded on the mirrored frame)
         image_height, image_width, _ = frame.shape
         
-        rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        rgb_image.flags.writeable = False
-        results = self.holistic.process(rgb_image)
-        rgb_image.flags.writeable = True
-        
-        body_center = None
-        if results.pose_landmarks:
-            mp_drawing.draw_landmarks(frame, results.pose_landmarks, mp_pose.POSE_CONNECTIONS)
-            
-            # Body Center Calculation
-            left_shoulder = results.pose_landmarks.landmark[mp_pose.PoseLandmark.LEFT_SHOULDER]
-            right_shoulder = results.pose_landmarks.landmark[mp_pose.PoseLandmark.RIGHT_SHOULDER]
-            nose = results.pose_landmarks.landmark[mp_pose.PoseLandmark.NOSE]
-            
-            if left_shoulder.visibility > 0.5 and right_shoulder.visibility > 0.5 and nose.visibility > 0.5:
-                shoulder_mid_x = (left_shoulder.x + right_shoulder.x) / 2
-                shoulder_mid_y = (left_shoulder.y + right_shoulder.y) / 2
-                
-                # Average the Y of the shoulder midpoint and the nose
-                body_center_x = shoulder_mid_x * image_width
-                body_center_y = ((shoulder_mid_y + nose.y) / 2) * image_height
-                
-                body_center = (int(body_center_x), int(body_center_y))
-                cv2.circle(frame, body_center, 7, (255, 0, 0), -1) # Blue circle
-
-                draw_additional_guidelines(frame, body_center)
-
-        # Hand position detection
-        physical_right_hand_pos = None # User's right hand (screen left)
-        physical_left_hand_pos = None  # User's left hand (screen right)
-
-        # Right hand (Screen Left)
-        right_hand_coords = None
-        if results.left_hand_landmarks:
-            mp_drawing.draw_landmarks(frame, results.left_hand_landmarks, mp_holistic.HAND_CONNECTIONS)
-            right_hand_coords = get_palm_top_coords(results.left_hand_landmarks, image_width, image_height)
-        elif results.pose_landmarks:
-            wrist = results.pose_landmarks.landmark[mp_pose.PoseLandmark.LEFT_WRIST]
-            if wrist.visibility > 0.5:
-                right_hand_coords = (int(wrist.x * image_width), int(wrist.y * image_height))
-        
-        if right_hand_coords and body_center:
-            angle = calculate_angle(body_center, right_hand_coords)
-            physical_right_hand_pos = get_hand_position(angle)
-            if physical_right_hand_pos:
-                cv2.putText(frame, f'Right Hand (Screen): {physical_right_hand_pos}', (10, 60),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (200, 200, 0), 2)
-        
-        # Store for debug visualization
-        self.debug_right_hand_coords = right_hand_coords
-        self.debug_body_center = body_center
-
-        # Left hand (Screen Right)
-        left_hand_coords = None
-        if results.right_hand_landmarks:
-            mp_drawing.draw_landmarks(frame, results.right_hand_landmarks, mp_holistic.HAND_CONNECTIONS)
-            left_hand_coords = get_palm_top_coords(results.right_hand_landmarks, image_width, image_height)
-        elif results.pose_landmarks:
-            wrist = results.pose_landmarks.landmark[mp_pose.PoseLandmark.RIGHT_WRIST]
-            if wrist.visibility > 0.5:
-                left_hand_coords = (int(wrist.x * image_width), int(wrist.y * image_height))
-        
-        if left_hand_coords and body_center:
-            angle = calculate_angle(body_center, left_hand_coords)
-            physical_left_hand_pos = get_hand_position(angle)
-            if physical_left_hand_pos:
-                cv2.putText(frame, f'Left Hand (Screen): {physical_left_hand_pos}', (10, 30),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-        
-        # Store for debug visualization
-        self.debug_left_hand_coords = left_hand_coords
+        landmarks, landmarks_timestamp, new_landmarks = self.infer_landmarks(frame)
+        if self.landmark_recorder:
+            self.landmark_recorder.record(self.frame_seq, self.frame_timestamp, landmarks_timestamp, new_landmarks,
+                                          image_width, image_height, landmarks)
+
+        # Body center and hands (pixels), smoothed and predicted between two inferences by the motion model
+        points = get_tracked_points(landmarks, image_width, image_height)
+        if self.motion_model:
+            if new_landmarks:
+                self.motion_model.correct(landmarks_timestamp, points, image_width)
+            points = self.motion_model.predict(self.frame_timestamp)
+
+        body_center = point_to_tuple(points[BODY_CENTER])
+        right_hand_coords = point_to_tuple(points[RIGHT_HAND]) # Right hand (Screen Left)
+        left_hand_coords = point_to_tuple(points[LEFT_HAND])   # Left hand (Screen Right)
+
+        # Hand position detection (both hands at once)
+        # User's right hand (screen left), user's left hand (screen right)
+        if self.stabilizer:
+            octants, _ = self.stabilizer.update(points)  # (one vote per camera frame, see above)
+        else:
+            octants = classify_octants(points)
+        physical_right_hand_pos, physical_left_hand_pos = get_hand_positions(octants)
             
         # Logging
         if self.valid_landmarks_flag :
@@ -283,17 +286,10 @@ class WebcamPanel:
 
         # Semaphore Interpretation
         detected_semaphore = "NONE"
-        if physical_right_hand_pos and physical_left_hand_pos:
-            key = (physical_right_hand_pos, physical_left_hand_pos)
-            detected_semaphore = SEMAPHORE_LETTERS.get(key, "NONE")
-            if detected_semaphore != "NONE":
-                 draw_guide_lines(frame, body_center, detected_semaphore, image_width, image_height)
-            else:
-                # Only show current hand positions if not forming a valid letter
-                draw_filled_octant(frame, body_center, physical_right_hand_pos, (200, 200, 0), 
-                                  alpha=0.15, image_width=image_width, image_height=image_height)
-                draw_filled_octant(frame, body_center, physical_left_hand_pos, (0, 255, 0), 
-                                  alpha=0.15, image_width=image_width, image_height=image_height)
+        if self.stabilizer:
+            detected_semaphore = self.stabilizer.symbol
+        elif physical_right_hand_pos and physical_left_hand_pos:
+            detected_semaphore = semaphore_alphabet.lookup(octants)
         
         # Logging
         if detected_semaphore != self.last_detected_semaphore:
@@ -303,22 +299,194 @@ class WebcamPanel:
                 'left_hand': left_hand_coords,
                 'body_center': body_center
             })
+
+        # Store for the overlays
+        self.tracked_points = points / (image_width, image_height)
+        self.octants = octants
+        self.detected_semaphore = detected_semaphore
+        self.frame = frame
+        if self.calibration_deadline is not None and time.perf_counter() >= self.calibration_deadline:
+            self.finish_marker_calibration(frame)
         return frame, detected_semaphore
 
+    def calibrate_markers(self, delay=3.0):
+        """Starts the colour marker calibration ("markers" backend): the player has `delay` seconds to hold
+        the markers in the boxes drawn over the webcam image, then the marker colours are sampled there
+        """
+        if self.backend_name != "markers":
+            print("Marker calibration needs the \"markers\" backend.")
+            return
+        self.calibration_deadline = time.perf_counter() + delay
+        print(f"Marker calibration in {delay:g} s: hold the markers in the boxes")
+
+    def finish_marker_calibration(self, frame):
+        self.calibration_deadline = None
+        calibration = calibrate_markers(frame, getattr(self.backend, 'face_detector', None))
+        save_marker_calibration(calibration, self.backend_params.get('calibration_path', MARKER_CALIBRATION_PATH))
+        if self.backend:
+            self.backend.set_calibration(calibration)
+        if self.inference_worker:
+            self.inference_worker.restart()  # loads the saved calibration
+        self.webcam_logger.markers_calibrated(calibration)
+        print(f"Markers calibrated: {calibration}")
+
+    def vision_stats(self):
+        """Counters of the vision pipeline since the start (for the profiler printout and the benchmark)"""
+        stats = {
+            'dropped_frames': self.capture.dropped_frames,  # frames the source dropped before they were read
+        }
+        if self.motion_gate:
+            stats['gated_frames'] = self.motion_gate.skipped_frames  # frames the motion gate didn't infer
+        if self.landmark_recorder:
+            stats['recorded_frames'] = self.landmark_recorder.record_count
+        return stats
+
+    def log_camera_configuration(self):
+        """Logs the capture settings granted by the camera, warns about the ones that differ from the request"""
+        requested, granted = self.capture.requested, self.capture.granted
+        self.webcam_logger.camera_configured(requested, granted)
+        if granted is None:
+            print("Camera could not be opened.")
+            return
+        print(f"Camera: {granted['width']}x{granted['height']} {granted['fourcc']} {granted['fps']:g} fps, "
+              f"buffer {granted['buffer_size']} ({granted['backend']})")
+        for setting, value in requested.items():
+            if value and granted[setting] != value and not (setting == 'fps' and abs(granted[setting] - value) < 0.5):
+                print(f"Camera: requested {setting} {value} but got {granted[setting]}")
+
+    def infer_landmarks(self, frame):
+        """Returns (landmarks, capture timestamp of the frame they come from, True if not returned before)
+        for the (flipped, BGR) frame. The landmarks can come from an older frame: with the inference process
+        (most recent result available) or when the motion model skips the inference for this frame.
+        When the motion gate finds the frame unchanged, the last landmarks are returned for this frame.
+        """
+        if self.landmark_replay:
+            self.landmarks, self.landmarks_timestamp, new_landmarks = self.capture.read_landmarks()
+            if new_landmarks:
+                self.landmarks_confidence = get_confidence(self.landmarks)  # (not recorded)
+            return self.landmarks, self.landmarks_timestamp, new_landmarks
+
+        if self.motion_model and not self.motion_model.should_infer(self.frame_timestamp):
+            if self.inference_worker:
+                return self.poll_inference_worker()
+            return self.landmarks, self.landmarks_timestamp, False
+
+        if self.motion_gate and not self.motion_gate.should_infer(frame, self.frame_timestamp):
+            if self.inference_worker:
+                landmarks, landmarks_timestamp, new_landmarks = self.poll_inference_worker()
+                if new_landmarks:
+                    return landmarks, landmarks_timestamp, True
+                if self.inference_worker.last_submitted_seq > self.inference_worker.latest_seq:
+                    # a frame is still being inferred: re-stamped landmarks would be newer than its result
+                    return self.landmarks, self.landmarks_timestamp, False
+            # nothing moved since the last inferred frame: its landmarks still hold for this frame
+            self.landmarks_timestamp = self.frame_timestamp
+            return self.landmarks, self.landmarks_timestamp, True
+
+        if self.inference_worker:
+            if self.inference_worker.submit(frame, self.frame_seq, self.frame_timestamp) and self.motion_gate:
+                self.motion_gate.accept()
+            return self.poll_inference_worker()
+
+        if self.motion_gate:
+            self.motion_gate.accept()
+
+        start = time.perf_counter()
+        if self.roi_tracker:
+            self.landmarks, self.landmarks_confidence = self.roi_tracker.process(self.backend, frame)
+        else:
+            self.landmarks, self.landmarks_confidence = process_bgr(self.backend, frame)
+        self.report_inference_time(time.perf_counter() - start)
+        self.landmarks_timestamp = self.frame_timestamp
+        return self.landmarks, self.landmarks_timestamp, True
+
+    def poll_inference_worker(self):
+        landmarks, confidence, _, timestamp = self.inference_worker.latest()
+        for inference_time in self.inference_worker.take_inference_times():
+            self.report_inference_time(inference_time)
+        if landmarks is None or landmarks is self.landmarks:
+            return self.landmarks, self.landmarks_timestamp, False
+        self.landmarks, self.landmarks_confidence, self.landmarks_timestamp = landmarks, confidence, timestamp
+        return self.landmarks, self.landmarks_timestamp, True
+
+    def draw_overlays(self, frame):
+        """Draws the vision results (landmarks, guidelines, octants, hand arrows) on the resized webcam image"""
+        image_height, image_width = frame.shape[:2]
+        scale = image_width / 640  # overlay sizes were designed for a 640px wide image
+        thickness = max(1, round(2 * scale))
+
+        # Landmarks
+        landmarks = self.landmarks
+        full_detail = self.overlay_detail == "full"
+        if full_detail and is_detected(landmarks[POSE_ROWS]):
+            draw_landmarks(frame, landmarks[POSE_ROWS], mp_pose.POSE_CONNECTIONS, image_width, image_height)
+        for hand_rows in (LEFT_HAND_ROWS, RIGHT_HAND_ROWS):
+            if full_detail and is_detected(landmarks[hand_rows]):
+                draw_landmarks(frame, landmarks[hand_rows], mp_holistic.HAND_CONNECTIONS, image_width, image_height)
+
+        points = self.tracked_points * (image_width, image_height)
+        body_center = point_to_tuple(points[BODY_CENTER])
+        right_hand_coords = point_to_tuple(points[RIGHT_HAND])
+        left_hand_coords = point_to_tuple(points[LEFT_HAND])
+        physical_right_hand_pos, physical_left_hand_pos = get_hand_positions(self.octants)
+
+        if body_center:
+            cv2.circle(frame, body_center, max(2, round(7 * scale)), (255, 0, 0), -1) # Blue circle
+            draw_additional_guidelines(frame, body_center, thickness)
+
+        if physical_right_hand_pos:
+            cv2.putText(frame, f'Right Hand (Screen): {physical_right_hand_pos}', (10, round(60 * scale)),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7 * scale, (200, 200, 0), thickness)
+        if physical_left_hand_pos:
+            cv2.putText(frame, f'Left Hand (Screen): {physical_left_hand_pos}', (10, round(30 * scale)),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7 * scale, (0, 255, 0), thickness)
+
+        if is_detected(landmarks[POSE_ROWS]):
+            cv2.putText(frame, f'Confidence: {self.landmarks_confidence:.2f}', (10, round(90 * scale)),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7 * scale, (255, 255, 255), thickness)
+
+        if physical_right_hand_pos and physical_left_hand_pos:
+            if self.detected_semaphore != "NONE":
+                draw_guide_lines(frame, body_center, self.detected_semaphore)
+            elif full_detail:
+                # Only show current hand positions if not forming a valid letter
+                draw_filled_octant(frame, body_center, self.octants[0], (200, 200, 0), alpha=0.15)
+                draw_filled_octant(frame, body_center, self.octants[1], (0, 255, 0), alpha=0.15)
+
+        if body_center:
+            if right_hand_coords:
+                cv2.arrowedLine(frame, body_center, right_hand_coords, 
+                              (0, 200, 200), max(1, round(3 * scale)), tipLength=0.3)
+            if left_hand_coords:
+                cv2.arrowedLine(frame, body_center, left_hand_coords, 
+                              (0, 255, 0), max(1, round(3 * scale)), tipLength=0.3)
+
+    def draw_calibration(self, frame):
+        """Marker calibration boxes and countdown"""
+        image_height, image_width = frame.shape[:2]
+        scale = image_width / 640
+        for x0, y0, x1, y1 in CALIBRATION_BOXES.values():
+            cv2.rectangle(frame, (round(x0 * image_width), round(y0 * image_height)),
+                          (round(x1 * image_width), round(y1 * image_height)), (0, 255, 255), max(1, round(2 * scale)))
+        remaining = math.ceil(self.calibration_deadline - time.perf_counter())
+        cv2.putText(frame, f'Hold the markers in the boxes: {remaining}', (10, image_height - round(20 * scale)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7 * scale, (0, 255, 255), max(1, round(2 * scale)))
+
+    def draw_dirty(self, surface, frame, debug_mode=False, force=False):
+        """draw() for the dirty rectangle rendering (see game/UI/compositor.py): returns the changed screen rects
+        (the webcam image when it was redrawn)
+        """
+        display_key = self.display_key
+        self.draw(surface, frame, debug_mode)
+        if self.display_rect is None or (not force and self.display_key == display_key):
+            return []
+        return [self.display_rect]
+
     def draw(self, surface, frame, debug_mode=False):
         if frame is None:
             return
-        
-        if self.debug_body_center:
-            if self.debug_right_hand_coords:
-                cv2.arrowedLine(frame, self.debug_body_center, self.debug_right_hand_coords, 
-                              (0, 200, 200), 3, tipLength=0.3)
-            if self.debug_left_hand_coords:
-                cv2.arrowedLine(frame, self.debug_body_center, self.debug_left_hand_coords, 
-                              (0, 255, 0), 3, tipLength=0.3)
             
         x, y, w, h = self.rect
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         
         # Calculate aspect ratio to avoid stretching
         frame_height, frame_width = frame.shape[:2]
@@ -334,24 +502,132 @@ class WebcamPanel:
             new_height = h
             new_width = int(h * aspect_ratio)
         
-        frame = cv2.resize(frame, (new_width, new_height))
-        
-        frame_surface = pygame.surfarray.make_surface(np.rot90(frame))
-        frame_surface = pygame.transform.flip(frame_surface, True, False)
+        # Resize first: the overlays are drawn at display resolution.
+        # The display surface is only redrawn for a new frame, otherwise it's blitted again as is
+        frame_surface = self.get_display_surface(new_width, new_height)
+        display_key = (self.frame_seq, new_width, new_height, self.show_overlays, self.overlay_detail)
+        if display_key != self.display_key:
+            self.display_key = display_key
+            cv2.resize(frame, (new_width, new_height), dst=self.display_buffer)
+            if self.show_overlays:
+                self.draw_overlays(self.display_buffer)
+            if self.calibration_deadline is not None:
+                self.draw_calibration(self.display_buffer)
         
         # Center the frame in the rect
         offset_x = x + (w - new_width) // 2
         offset_y = y + (h - new_height) // 2
         
-        surface.blit(frame_surface, (offset_x, offset_y))
+        self.display_rect = surface.blit(frame_surface, (offset_x, offset_y))
+
+    def get_inference_settings(self, roi_params):
+        """(inference sizes, model complexities, inference rates) as configured, see inference_settings"""
+        inference_sizes = {}
+        if roi_params is not None:
+            roi_tracker = self.roi_tracker or RoiTracker(**roi_params)  # (same settings as the worker's)
+            inference_sizes = {name: getattr(roi_tracker, name) for name in ('full_inference_size', 'roi_inference_size')}
+        model_complexity = {}
+        if self.backend_name in BACKENDS:
+            backend_class = BACKENDS[self.backend_name]
+            defaults = inspect.signature(backend_class).parameters
+            model_complexity = {name: self.backend_params.get(name, defaults[name].default)
+                                for name in backend_class.COMPLEXITY_PARAMS}
+        rates = {}
+        if self.motion_model:
+            rates = {'min_rate': self.motion_model.min_rate, 'max_rate': self.motion_model.max_rate}
+        return inference_sizes, model_complexity, rates
+
+    def report_inference_time(self, inference_time):
+        """Duration (seconds) of an inference, for the inference quality controller"""
+        if self.inference_quality:
+            level = self.inference_quality.update(inference_time, time.perf_counter())
+            if level is not None:
+                self.set_inference_quality(level)
+
+    def report_frame_time(self, frame_time):
+        """Duration (seconds) of the last game loop iteration, for the overlay quality controller"""
+        if self.overlay_quality:
+            level = self.overlay_quality.update(frame_time, time.perf_counter())
+            if level is not None:
+                self.set_overlay_quality(level)
+
+    def set_inference_quality(self, level):
+        """Applies an inference quality level: inference sizes, model complexity and inference rate, relative
+        to the configured ones
+        """
+        inference_sizes, complexity, rates = inference_settings(self.inference_quality.levels[level],
+                                                                *self.configured_inference_settings)
+        if self.roi_tracker:
+            for name, value in inference_sizes.items():
+                setattr(self.roi_tracker, name, value)
+        if self.inference_worker:
+            self.inference_worker.set_roi_settings(**inference_sizes)
+
+        backend_params = {**self.backend_params, **complexity}
+        if self.inference_worker:
+            # (the worker goes back to its previous parameters by itself if it can't load the new ones, and
+            # doesn't try them again)
+            self.inference_worker.set_backend_params({**self.inference_worker.backend_params, **complexity})
+        elif self.backend and backend_params != self.backend_params and backend_params not in self.failed_backend_params:
+            try:
+                backend = create_backend(self.backend_name, **backend_params)
+            except (OSError, RuntimeError) as error:
+                # e.g. a model that mediapipe must download first, without network
+                print(f"Could not load the {self.backend_name} backend with {backend_params}, keeping the current one: {error}")
+                self.failed_backend_params.append(backend_params)
+            else:
+                self.backend.close()
+                self.backend = backend
+                self.backend_params = backend_params
+
+        if self.motion_model:
+            self.motion_model.min_rate = rates['min_rate']
+            self.motion_model.max_rate = rates['max_rate']
+            self.motion_model.rate = min(max(self.motion_model.rate, rates['min_rate']), rates['max_rate'])
+
+        # complexity in effect (the backend is kept when the new one can't be loaded)
+        params_in_effect = self.inference_worker.backend_params if self.inference_worker else self.backend_params
+        complexity = {name: params_in_effect.get(name, value)
+                      for name, value in self.configured_inference_settings[1].items()}
+        settings = {**inference_sizes, **complexity, **rates}
+        inference_time = self.inference_quality.decision_time
+        self.webcam_logger.quality_changed("inference", level, settings, inference_time)
+        print(f"Inference quality level {level} (inference time {inference_time * 1000:.1f} ms): {settings}")
+
+    def set_overlay_quality(self, level):
+        """Applies an overlay quality level (drawing detail of the vision overlays)"""
+        quality = self.overlay_quality.levels[level]
+        self.overlay_detail = quality['overlays']
+
+        frame_time = self.overlay_quality.decision_time
+        self.webcam_logger.quality_changed("overlays", level, quality, frame_time)
+        print(f"Overlay quality level {level} (frame time {frame_time * 1000:.1f} ms): {quality}")
+
+    def get_display_surface(self, width, height):
+        """Surface sharing the memory of the display buffer, (re)allocated when the display size changes"""
+        if self.display_buffer is None or self.display_buffer.shape[:2] != (height, width):
+            self.display_buffer = np.zeros((height, width, 3), dtype=np.uint8)
+            self.display_key = None
+            self.display_surface = pygame.image.frombuffer(self.display_buffer, (width, height), "BGR")
+        return self.display_surface
 
-    
     def close(self):
         """Explicitly release MediaPipe and any other resources"""
-        if self.holistic:
-            self.holistic.close()
-            self.holistic = None
-            print("MediaPipe Holistic closed.")
+        if self.capture:
+            self.capture.release()
+            self.capture = None
+        if self.inference_worker:
+            self.inference_worker.close()
+            self.inference_worker = None
+            print("Inference process stopped.")
+        if self.backend:
+            self.backend.close()
+            self.backend = None
+            print("Recognition backend closed.")
+        if self.landmark_recorder:
+            self.landmark_recorder.close()
+            print(f"Landmark recording closed ({self.landmark_recorder.record_count} records).")
+            self.landmark_recorder = None
 
     def __del__(self):
         self.close()
\ No newline at end of file
@@ -10,4 +10,5 @@ class Effect:
             self.alive = False
 
     def draw(self, surface):
-        pass
+        """Draws the effect, returns the list of screen rects it drew to"""
+        return []
@@ -10,4 +10,4 @@ class ExplosionEffect(Effect):
 
     def draw(self, surface):
         rect = self.sprite.get_rect(center=self.pos)
-        surface.blit(self.sprite, rect)
+        return [surface.blit(self.sprite, rect)]
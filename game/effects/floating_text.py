@@ -1,5 +1,6 @@
 # game/effects/floating_text.py
 from game.effects.base_effect import Effect
+from game.fonts import render_text
 
 class FloatingTextEffect(Effect):
     def __init__(self, pos, text, font, color):
@@ -14,6 +15,6 @@ class FloatingTextEffect(Effect):
         self.y -= 30 * dt  # slide up
 
     def draw(self, surface):
-        surf = self.font.render(self.text, True, self.color)
+        surf = render_text(self.text, self.font, self.color)
         rect = surf.get_rect(center=(self.x, self.y))
-        surface.blit(surf, rect)
+        return [surface.blit(surf, rect)]
@@ -0,0 +1,50 @@
+from collections import OrderedDict
+
+import pygame
+
+# --- Font registry ---
+# SysFont looks the font file up on every call: fonts are created once per (family, size, bold, italic)
+FONTS = {}
+
+def get_font(family="Arial", size=24, bold=False, italic=False):
+    """Shared pygame font for the given family, size and style"""
+    key = (family, size, bold, italic)
+    if key not in FONTS:
+        FONTS[key] = pygame.font.SysFont(family, size, bold=bold, italic=italic)
+    return FONTS[key]
+
+
+class TextCache:
+    """Rendered text surfaces, cached (LRU) by text, font, colour and antialiasing.
+
+    Texts drawn on every frame (labels, unchanged scores) are only rendered once. Texts that change on every
+    frame (e.g. debug values) just go through the cache and are the first evicted.
+    The returned surfaces are shared: blit them, never draw on them.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()  # (text, font, color, antialias) -> surface
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, font, color, antialias=True):
+        key = (text, font, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+text_cache = TextCache()
+
+def render_text(text, font, color, antialias=True):
+    """font.render(text, antialias, color) through the shared text cache"""
+    return text_cache.render(text, font, color, antialias)
@@ -12,6 +12,7 @@ from game.missiles.spawner_bkt_pick import BKTPickSpawner
 from game.effects.explosion import ExplosionEffect
 from game.effects.floating_text import FloatingTextEffect
 from game.other_gameplay.buildings import BuildingGrid
+from game.fonts import get_font, render_text
 
 class Gameplay:
     def __init__(self, rect, gameplay_logger):
@@ -41,6 +42,11 @@ class Gameplay:
         self.building_pattern_path = "assets/building_patterns/building_pattern_1"
         self.buildings = BuildingGrid(self.grid_size, self.rect, self.building_pattern_path)
 
+        # --- Static layer: background + grid overlay + buildings, composited once (see draw_static_layer) ---
+        self.static_layer = None
+        self.static_layer_key = None  # (size, debug_mode) it was drawn for, None = must be redrawn
+        self.drawn_rects = []  # screen rects of the missiles and effects drawn last frame (see draw_dirty)
+
         # self.spawner = RandomPickSpawner(gameplay=self, available_letters=["A", "E", "I", "O", "U"])
         # --- Missile spawner (BKT-based) ---
         self.spawner = BKTPickSpawner(
@@ -76,8 +82,8 @@ class Gameplay:
 
         self.missiles = []
 
-        self.missile_font = pygame.font.SysFont("Arial", 64, bold=True)
-        self.score_font = pygame.font.SysFont("Arial", 20, bold=True)
+        self.missile_font = get_font("Arial", 64, bold=True)
+        self.score_font = get_font("Arial", 20, bold=True)
 
         self.last_time = pygame.time.get_ticks()
         
@@ -209,6 +215,7 @@ class Gameplay:
                     # missile reached a building
                     self.buildings.grid[row][col] = 1   # change sprite to damaged
                     self.buildings.grid[row+1][col] = 0 # remove damaged sprite above
+                    self.invalidate_static_layer()
                     missile.alive = False
                     # update BKT for building hit (miss) - only if not already updated
                     if isinstance(self.spawner, BKTPickSpawner):
@@ -246,6 +253,17 @@ class Gameplay:
         # else:
         self.draw_gameplay(surface, debug_mode)
 
+    def draw_dirty(self, surface, debug_mode=False, force=False):
+        """draw() for the dirty rectangle rendering (see game/UI/compositor.py): returns the screen rects that
+        changed, the whole section when the static layer changed (or in debug mode), otherwise where the
+        missiles and effects were drawn this frame and the last one
+        """
+        static_changed = force or debug_mode or self.static_layer_key != (self.rect.size, debug_mode)
+        drawn_rects = self.draw_gameplay(surface, debug_mode)
+        changed_rects = [self.rect] if static_changed else self.drawn_rects + drawn_rects
+        self.drawn_rects = drawn_rects
+        return changed_rects
+
     # # -------------------------------------------------------
     # #                TERMINAL DEBUG VIEW
     # # -------------------------------------------------------
@@ -266,21 +284,35 @@ class Gameplay:
         pygame.draw.rect(shape_surf, color, shape_surf.get_rect())
         surface.blit(shape_surf, rect)
 
-    def draw_gameplay(self, surface, debug_mode=False):
+    def invalidate_static_layer(self):
+        """Redraws the static layer on the next frame (call when the buildings change)"""
+        self.static_layer_key = None
+
+    def draw_static_layer(self, debug_mode):
+        """Background, grid overlay (debug mode) and buildings, in a surface the size of the gameplay rect.
+        Only redrawn when the rect size, the debug mode or the buildings changed
+        """
+        key = (self.rect.size, debug_mode)
+        if key == self.static_layer_key:
+            return self.static_layer
+        self.static_layer_key = key
+        if self.static_layer is None or self.static_layer.get_size() != self.rect.size:
+            self.static_layer = pygame.Surface(self.rect.size).convert()
+        layer = self.static_layer
+
         # --- Background ---
         bg = pygame.transform.smoothscale(
             self.background_image,
             (self.rect.width, self.rect.height)
         )
-        surface.blit(bg, self.rect.topleft)
+        layer.blit(bg, (0, 0))
 
         # --- Grid overlay (visible for now) ---
         if debug_mode:
             for row in range(self.grid_size):
                 for col in range(self.grid_size):
-                    cell_x = self.grid_origin[0] + col * self.cell_size
-                    # cell_y = self.grid_origin[1] + row * self.cell_size
-                    cell_y = self.grid_origin[1] + (self.grid_size - 1 - row) * self.cell_size
+                    cell_x = col * self.cell_size
+                    cell_y = (self.grid_size - 1 - row) * self.cell_size
 
                     cell_rect = pygame.Rect(
                         cell_x, cell_y,
@@ -295,11 +327,35 @@ class Gameplay:
                     else:
                         color = (255, 80, 80, 100)
 
-                    pygame.draw.rect(surface, color, cell_rect, 1)
-        
+                    pygame.draw.rect(layer, color, cell_rect, 1)
+
+        # --- Buildings ---
+        self.buildings.draw(layer, offset=(-self.rect.left, -self.rect.top))
+        return layer
+
+    def draw_gameplay(self, surface, debug_mode=False):
+        """Draws the gameplay view, clipped to the section rect (hint cards and texts near the edge would spill
+        over the panels, which the dirty rectangle rendering doesn't redraw). Returns the screen rects of the
+        missiles and effects
+        """
+        previous_clip = surface.get_clip()
+        surface.set_clip(self.rect.clip(previous_clip))
+        try:
+            drawn_rects = self.draw_gameplay_content(surface, debug_mode)
+        finally:
+            surface.set_clip(previous_clip)
+        clipped_rects = (pygame.Rect(rect).clip(self.rect) for rect in drawn_rects)
+        return [rect for rect in clipped_rects if rect.width and rect.height]
+
+    def draw_gameplay_content(self, surface, debug_mode=False):
+        """Draws the gameplay view (unclipped), returns the screen rects of the missiles and effects"""
+        # --- Background, grid overlay and buildings (cached) ---
+        surface.blit(self.draw_static_layer(debug_mode), self.rect.topleft)
+        drawn_rects = []
+
         # --- Missiles ---
         for missile in self.missiles:
-            missile.draw(surface)
+            drawn_rects.extend(missile.draw(surface))
             
             # Missile debug info (only in debug mode)
             if debug_mode:
@@ -327,11 +383,11 @@ class Gameplay:
                     ])
                 
                 # Draw missile info text
-                debug_font = pygame.font.SysFont("Arial", 14)
+                debug_font = get_font("Arial", 14)
                 text_y = missile.y + 60
                 for line in debug_lines:
                     if line:  # Only draw non-empty lines
-                        text_surface = debug_font.render(line, True, (255, 255, 0))
+                        text_surface = render_text(line, debug_font, (255, 255, 0))
                         text_rect = text_surface.get_rect(center=(missile.x, text_y))
                         # Draw background for readability
                         bg_rect = text_rect.inflate(4, 2)
@@ -341,7 +397,7 @@ class Gameplay:
 
         # --- Debug: Show all semaphores with P(K) ---
         if debug_mode and isinstance(self.spawner, BKTPickSpawner):
-            debug_font_small = pygame.font.SysFont("Arial", 12)
+            debug_font_small = get_font("Arial", 12)
             x_offset = self.rect.left + 10
             y_offset = self.rect.top + 10
             
@@ -353,7 +409,7 @@ class Gameplay:
             next_probs = self.spawner.get_selection_probabilities()
             
             # Title
-            title_surface = debug_font_small.render("Semaphore Knowledge:", True, (255, 255, 255))
+            title_surface = render_text("Semaphore Knowledge:", debug_font_small, (255, 255, 255))
             title_bg = pygame.Rect(x_offset - 2, y_offset - 2, title_surface.get_width() + 4, title_surface.get_height() + 4)
             self.draw_transparent_rect(surface, (0, 0, 0, 120), title_bg)
             surface.blit(title_surface, (x_offset, y_offset))
@@ -372,7 +428,7 @@ class Gameplay:
                     color = (255, 255, 255)
                 
                 text = f"{letter}: {p_k:.3f} (S: {s_s}) [P: {prob:.2f}]"
-                text_surface = debug_font_small.render(text, True, color)
+                text_surface = render_text(text, debug_font_small, color)
                 text_bg = pygame.Rect(x_offset - 2, y_offset - 2, text_surface.get_width() + 4, text_surface.get_height() + 4)
                 self.draw_transparent_rect(surface, (0, 0, 0, 100), text_bg)
                 surface.blit(text_surface, (x_offset, y_offset))
@@ -380,15 +436,12 @@ class Gameplay:
 
         # --- Effects ---
         for effect in self.effects:
-            effect.draw(surface)
-
-        # --- Buildings ---
-        self.buildings.draw(surface)
+            drawn_rects.extend(effect.draw(surface))
 
         # --- Shortcuts info (bottom left) ---
-        shortcut_font = pygame.font.SysFont("Arial", 12)
-        shortcut_text = "D: Debug | P: Profiler"
-        shortcut_surface = shortcut_font.render(shortcut_text, True, (200, 200, 200))
+        shortcut_font = get_font("Arial", 12)
+        shortcut_text = "D: Debug | P: Profiler | O: Overlays"
+        shortcut_surface = render_text(shortcut_text, shortcut_font, (200, 200, 200))
         
         # Position at bottom-left corner
         sx = self.rect.left + 10
@@ -397,6 +450,7 @@ class Gameplay:
         shortcut_bg = pygame.Rect(sx - 4, sy - 2, shortcut_surface.get_width() + 8, shortcut_surface.get_height() + 4)
         self.draw_transparent_rect(surface, (0, 0, 0, 100), shortcut_bg)
         surface.blit(shortcut_surface, (sx, sy))
+        return drawn_rects
 
     # -------------------------------------------------------
     #                  Missile management
@@ -452,4 +506,5 @@ class Gameplay:
     def reset_buildings(self):
         # reapply initial building pattern
         self.buildings = BuildingGrid(self.grid_size, self.rect, self.building_pattern_path)
+        self.invalidate_static_layer()
     
\ No newline at end of file
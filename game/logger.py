@@ -146,6 +146,32 @@ class WebcamLogger(BaseLogger):
 			landmarks_positions=landmarks_positions
 		)
 
+	def camera_configured(self, requested, granted):
+		# when the camera is opened: capture settings requested and settings actually granted by the driver (None if no camera)
+		self.log(
+			"camera_configured",
+			requested=requested,
+			granted=granted
+		)
+
+	def quality_changed(self, controller, level, settings, duration):
+		# when an adaptive quality controller ("inference" or "overlays") changes its quality level
+		# (duration: inference / frame time statistic that triggered it, in seconds)
+		self.log(
+			"quality_changed",
+			controller=controller,
+			level=level,
+			settings=settings,
+			duration=duration
+		)
+
+	def markers_calibrated(self, calibration):
+		# when the colour markers are calibrated (marker HSV ranges and fixed body center, see game/vision/markers.py)
+		self.log(
+			"markers_calibrated",
+			calibration=calibration
+		)
+
 	def semaphore_detected(self, semaphore, landmarks_positions):
 		# when a semaphore is detected from the current hand positions that is different from the last detected one
 		self.log(
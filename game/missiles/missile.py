@@ -4,12 +4,40 @@ import uuid
 
 from assets.assets import PURPLE
 from assets.assets import SEMAPHORES_PATH
+from game.fonts import render_text
 
 
 sprite = pygame.image.load("assets/sprites/missile.png").convert_alpha()
 hint_sprites = [pygame.image.load(f"{SEMAPHORES_PATH}{chr(ord('A') + i)}.png").convert_alpha() for i in range(26)]
 hint_sprites = [pygame.transform.scale(img, (100, 100)) for img in hint_sprites]
 
+# Finished sprites, built on first use: the missile with its letter, and the outlined hint card of each letter
+letter_sprites = {}  # (letter, font) -> surface
+hint_cards = {}  # letter -> surface
+
+
+def get_letter_sprite(letter, font):
+	"""Missile sprite with the letter drawn at its center"""
+	key = (letter, font)
+	if key not in letter_sprites:
+		letter_sprite = sprite.copy()
+		letter_surface = render_text(letter, font, (0, 0, 0))
+		letter_sprite.blit(letter_surface, letter_surface.get_rect(center=letter_sprite.get_rect().center))
+		letter_sprites[key] = letter_sprite
+	return letter_sprites[key]
+
+def get_hint_card(letter):
+	"""Hint sprite of a letter on a white card with a purple rounded outline (3px around the sprite)"""
+	if letter not in hint_cards:
+		hint_sprite = hint_sprites[ord(letter) - ord('A')]
+		card = pygame.Surface((hint_sprite.get_width() + 6, hint_sprite.get_height() + 6), pygame.SRCALPHA)
+		outline_rect = card.get_rect()
+		pygame.draw.rect(card, (255, 255, 255), outline_rect, border_radius=8)
+		pygame.draw.rect(card, PURPLE, outline_rect, border_radius=8, width=3)
+		card.blit(hint_sprite, (3, 3))
+		hint_cards[letter] = card
+	return hint_cards[letter]
+
 class Missile:
 
 	def __init__(
@@ -36,6 +64,8 @@ class Missile:
 		self.sprite = sprite
 		self.hint_sprite = hint_sprites[ord(letter) - ord('A')]
 		self.font = font
+		self.letter_sprite = get_letter_sprite(letter, font)
+		self.hint_card = get_hint_card(letter)
 
 		self.gameplay = gameplay
 
@@ -84,17 +114,13 @@ class Missile:
 
 	# -------------------------------------------------------
 	def draw(self, surface):
+		"""Draws the missile (and its hint), returns the list of screen rects it drew to"""
 		if not self.alive:
-			return
+			return []
 
-		# Missile sprite
-		rect = self.sprite.get_rect(center=(self.x, self.y))
-		surface.blit(self.sprite, rect)
-
-		# Letter overlay
-		letter_surface = self.font.render(self.letter, True, (0, 0, 0))
-		letter_rect = letter_surface.get_rect(center=(self.x, self.y))
-		surface.blit(letter_surface, letter_rect)
+		# Missile sprite with its letter
+		rect = self.letter_sprite.get_rect(center=(self.x, self.y))
+		drawn_rects = [surface.blit(self.letter_sprite, rect)]
 
 		# Hint sprite (above missile)
 		if self.should_show_hint():
@@ -110,15 +136,9 @@ class Missile:
 							self.gameplay.spawner.on_missile_hint_shown(self.letter)
 							self.bkt_updated_flag = True
 
+			# Hint card (outline, background and hint sprite)
 			hint_rect = self.hint_sprite.get_rect(
 				center=(self.x, self.y - self.sprite.get_height() // 2 - self.hint_sprite.get_height() // 2 - 10)
 			)
-			# Draw outline and background
-			outline_rect = pygame.Rect(
-				hint_rect.x - 3, hint_rect.y - 3,
-				self.hint_sprite.get_width() + 6,
-				self.hint_sprite.get_height() + 6
-			)
-			pygame.draw.rect(surface, (255, 255, 255), outline_rect, border_radius=8)
-			pygame.draw.rect(surface, PURPLE, outline_rect, border_radius=8, width=3)
-			surface.blit(self.hint_sprite, hint_rect)
\ No newline at end of file
+			drawn_rects.append(surface.blit(self.hint_card, (hint_rect.x - 3, hint_rect.y - 3)))
+		return drawn_rects
\ No newline at end of file
@@ -48,7 +48,8 @@ class BuildingGrid:
 					except FileNotFoundError:
 						pass
 
-	def draw(self, surface):
+	def draw(self, surface, offset=(0, 0)):
+		# offset: added to the screen positions (e.g. to draw into a surface the size of the gameplay rect)
 		for row in range(self.grid_size):
 			for col in range(self.grid_size):
 				status = self.grid[row][col]
@@ -62,4 +63,4 @@ class BuildingGrid:
 				x = self.rect.left + col * self.cell_width
 				y = self.rect.bottom - (row + 1) * self.cell_height
 
-				surface.blit(sprite, (x, y))
+				surface.blit(sprite, (x + offset[0], y + offset[1]))
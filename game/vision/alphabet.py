@@ -0,0 +1,78 @@
+import numpy as np
+
+from game.vision.classification import HAND_POSITIONS, POSITION_OCTANTS, OCTANT_WIDTH
+
+# semaphore images and their mapping files (the randomized set shuffles the positions of the letters)
+# SEMAPHORES_PATH = "assets/semaphores/"
+SEMAPHORES_PATH = "assets/semaphores_randomized/"
+MAPPING_FILES = ("semaphores_mapping.txt", "other_semaphores_mapping.txt")
+
+
+def load_semaphores_mapping(semaphores_path=SEMAPHORES_PATH):
+    """(right position, left position) -> symbol mapping of the mapping files (lines "symbol hand1 hand2 image"),
+    both hand orders map to the symbol
+    """
+    mapping = {}
+    for filename in MAPPING_FILES:
+        with open(f"{semaphores_path}{filename}", 'r') as f:
+            for line in f:
+                parts = line.strip().split()
+                if len(parts) == 4:
+                    symbol, hand1, hand2, _ = parts
+                    mapping[(hand1, hand2)] = symbol
+                    mapping[(hand2, hand1)] = symbol
+    return mapping
+
+
+class SemaphoreAlphabet:
+    """Semaphore symbols compiled once from the (right position, left position) -> symbol mapping.
+
+    - table: 8x8 array, [right hand octant, left hand octant] -> symbol ("NONE" for unmapped pairs)
+    - reverse index: symbol -> (right, left) positions / octants
+    - octant polygons (relative to the body center), computed once per frame size
+    """
+
+    def __init__(self, mapping, polygon_points=20):
+        self.table = np.full((len(HAND_POSITIONS), len(HAND_POSITIONS)), "NONE", dtype=object)
+        self.positions = {}  # symbol -> (right position, left position)
+        self.octants = {}    # symbol -> (right octant, left octant)
+        for (right, left), symbol in mapping.items():
+            self.table[POSITION_OCTANTS[right], POSITION_OCTANTS[left]] = symbol
+            # first pair listed for a symbol, like the mapping file order
+            if symbol not in self.positions:
+                self.positions[symbol] = (right, left)
+                self.octants[symbol] = (POSITION_OCTANTS[right], POSITION_OCTANTS[left])
+
+        self.polygon_points = polygon_points
+        self.polygons = {}  # (image_width, image_height) -> (8, polygon_points + 2, 2) int32 offsets
+
+    def lookup(self, octants):
+        """Symbol for (right octant, left octant) as returned by classify_octants, "NONE" if a hand is missing"""
+        right, left = octants
+        if right < 0 or left < 0:
+            return "NONE"
+        return self.table[right, left]
+
+    def get_octants(self, symbol):
+        """(right octant, left octant) forming the symbol, None if unknown"""
+        return self.octants.get(symbol)
+
+    def get_octant_polygons(self, image_width, image_height):
+        """Filled wedge of every octant, as offsets from the body center, long enough to cover the frame"""
+        key = (image_width, image_height)
+        if key not in self.polygons:
+            radius = np.hypot(image_width, image_height)
+            polygons = np.zeros((len(HAND_POSITIONS), self.polygon_points + 2, 2), dtype=np.int32)
+            for octant in range(len(HAND_POSITIONS)):
+                center_angle = octant * OCTANT_WIDTH
+                angles = np.radians(np.linspace(center_angle - OCTANT_WIDTH / 2, center_angle + OCTANT_WIDTH / 2,
+                                                self.polygon_points + 1))
+                # first point stays at the body center (0, 0)
+                polygons[octant, 1:, 0] = radius * np.cos(angles)
+                polygons[octant, 1:, 1] = radius * np.sin(angles)
+            self.polygons[key] = polygons
+        return self.polygons[key]
+
+    def get_octant_polygon(self, octant, body_center, image_width, image_height):
+        """Filled wedge of one octant around the body center, in frame pixels"""
+        return self.get_octant_polygons(image_width, image_height)[octant] + np.asarray(body_center, dtype=np.int32)
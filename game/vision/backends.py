@@ -0,0 +1,328 @@
+import string
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from game.vision.landmarks import (
+    HAND_LANDMARK_COUNT, POSE_ROWS, LEFT_HAND_ROWS, RIGHT_HAND_ROWS,
+    empty_landmarks, is_detected, fill_landmarks, holistic_results_to_array, get_confidence
+)
+from game.vision.classification import OCTANT_WIDTH
+from game.vision.alphabet import SemaphoreAlphabet, load_semaphores_mapping
+from game.vision.recording import load_landmark_recording
+from game.vision.markers import (
+    MARKER_CALIBRATION_PATH, FaceDetector, find_marker, load_marker_calibration, marker_mask
+)
+
+mp_pose = mp.solutions.pose
+
+# name -> backend class, see register_backend / create_backend
+BACKENDS = {}
+
+def register_backend(name):
+    """Class decorator: makes the backend available to create_backend (and the WebcamPanel config) as `name`"""
+    def register(backend_class):
+        BACKENDS[name] = backend_class
+        return backend_class
+    return register
+
+def create_backend(name, **params):
+    """Builds the recognition backend registered under `name` with the given model parameters"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown recognition backend '{name}' (available: {', '.join(BACKENDS)})")
+    return BACKENDS[name](**params)
+
+
+class RecognitionBackend:
+    """Interface of the recognition backends: an RGB image in, the landmarks array out
+    (layout in game/vision/landmarks.py, the visibility column holds the per landmark confidence).
+    The game calls detect(), which adds the detection confidence: override it if the model has its own.
+    """
+
+    # constructor parameters setting the model complexity (0 or 1), used by the quality levels (quality.py)
+    COMPLEXITY_PARAMS = ()
+    # False if the landmarks can't come from a crop of the frame (e.g. a body center fixed in the frame)
+    SUPPORTS_ROI = True
+    # constructor parameters that need the game process when set (e.g. reading the pygame keyboard): the
+    # backend then runs in the game process, even with use_inference_process
+    GAME_PROCESS_PARAMS = ()
+
+    def process(self, rgb_image):
+        """Returns the landmarks array for an RGB image"""
+        raise NotImplementedError
+
+    def detect(self, rgb_image):
+        """Returns (landmarks array, detection confidence in [0, 1]) for an RGB image (by default the
+        confidence is computed from the landmarks' visibility, see get_confidence)
+        """
+        landmarks = self.process(rgb_image)
+        return landmarks, get_confidence(landmarks)
+
+    def close(self):
+        pass
+
+
+@register_backend("holistic")
+class HolisticBackend(RecognitionBackend):
+    """Full MediaPipe Holistic (pose + hands + face mesh, the face landmarks are not used)"""
+
+    COMPLEXITY_PARAMS = ('model_complexity',)
+
+    def __init__(self, model_complexity=1, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+        self.holistic = mp.solutions.holistic.Holistic(
+            model_complexity=model_complexity,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+
+    def process(self, rgb_image):
+        """Returns the landmarks array for an RGB image"""
+        return holistic_results_to_array(self.holistic.process(rgb_image))
+
+    def close(self):
+        self.holistic.close()
+
+
+@register_backend("pose_hands")
+class PoseHandsBackend(RecognitionBackend):
+    """Only runs the pose and hands models (no face mesh), same landmarks layout as HolisticBackend.
+    pose_model_complexity: 0, 1 or 2 / hands_model_complexity: 0 or 1 (lower is faster)
+    """
+
+    COMPLEXITY_PARAMS = ('pose_model_complexity', 'hands_model_complexity')
+
+    def __init__(self, pose_model_complexity=1, hands_model_complexity=1,
+                 min_detection_confidence=0.5, min_tracking_confidence=0.5):
+        self.pose = mp.solutions.pose.Pose(
+            model_complexity=pose_model_complexity,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+        self.hands = mp.solutions.hands.Hands(
+            max_num_hands=2,
+            model_complexity=hands_model_complexity,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+
+    def process(self, rgb_image):
+        """Returns the landmarks array for an RGB image"""
+        landmarks = empty_landmarks()
+        pose_results = self.pose.process(rgb_image)
+        fill_landmarks(landmarks, POSE_ROWS, pose_results.pose_landmarks)
+        pose_landmarks = landmarks[POSE_ROWS]
+        if not is_detected(pose_landmarks):
+            # no body center without a pose: the hands would be useless, don't pay for the hands model
+            return landmarks
+
+        hand_results = self.hands.process(rgb_image)
+        if not hand_results.multi_hand_landmarks:
+            return landmarks
+
+        hands = []
+        for hand_landmarks in hand_results.multi_hand_landmarks:
+            hand = empty_landmarks()[:HAND_LANDMARK_COUNT]
+            fill_landmarks(hand, slice(0, HAND_LANDMARK_COUNT), hand_landmarks, has_visibility=False)
+            hands.append(hand)
+
+        # Like Holistic: a hand belongs to the closest pose wrist (left_hand <-> LEFT_WRIST)
+        left_wrist = pose_landmarks[mp_pose.PoseLandmark.LEFT_WRIST, :2]
+        right_wrist = pose_landmarks[mp_pose.PoseLandmark.RIGHT_WRIST, :2]
+        closer_to_left = [
+            np.linalg.norm(hand[0, :2] - left_wrist) - np.linalg.norm(hand[0, :2] - right_wrist)
+            for hand in hands
+        ]
+        if len(hands) == 1:
+            landmarks[LEFT_HAND_ROWS if closer_to_left[0] < 0 else RIGHT_HAND_ROWS] = hands[0]
+        else:
+            order = np.argsort(closer_to_left)
+            landmarks[LEFT_HAND_ROWS] = hands[order[0]]
+            landmarks[RIGHT_HAND_ROWS] = hands[order[1]]
+        return landmarks
+
+    def close(self):
+        self.pose.close()
+        self.hands.close()
+
+
+@register_backend("pose")
+class PoseBackend(RecognitionBackend):
+    """Pose model only (cheapest MediaPipe option): no hand landmarks, the hands are tracked at the pose wrists"""
+
+    COMPLEXITY_PARAMS = ('model_complexity',)
+
+    def __init__(self, model_complexity=1, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+        self.pose = mp.solutions.pose.Pose(
+            model_complexity=model_complexity,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+
+    def process(self, rgb_image):
+        """Returns the landmarks array for an RGB image"""
+        landmarks = empty_landmarks()
+        fill_landmarks(landmarks, POSE_ROWS, self.pose.process(rgb_image).pose_landmarks)
+        return landmarks
+
+    def close(self):
+        self.pose.close()
+
+
+@register_backend("replay")
+class ReplayBackend(RecognitionBackend):
+    """Returns the landmarks of a landmark recording (see game/vision/recording.py), one inference result per
+    call, whatever the image. Unlike the "landmarks" frame source, it runs with any frame source and timing.
+    """
+
+    SUPPORTS_ROI = False  # recorded landmarks are relative to the full frame, not to the crop they are given
+
+    def __init__(self, path, loop=True):
+        records = load_landmark_recording(path)
+        self.landmarks = records['landmarks'][records['new_landmarks']]  # actual inference results only
+        self.loop = loop
+        self.index = 0
+
+    def process(self, rgb_image):
+        """Returns the landmarks array for an RGB image"""
+        if self.index >= len(self.landmarks):
+            if not self.loop or len(self.landmarks) == 0:
+                return empty_landmarks()
+            self.index = 0
+        landmarks = np.array(self.landmarks[self.index])
+        self.index += 1
+        return landmarks
+
+
+def player_landmarks(right_octant, left_octant, aspect_ratio=4 / 3, angle_noise=0.0, rng=None):
+    """Landmarks array of a player facing the camera with their hands in the given octants (-1 = hand down
+    out of frame). angle_noise: standard deviation of the arm angles, in degrees.
+    """
+    rng = rng or np.random.default_rng()
+    landmarks = empty_landmarks()
+    center_x, center_y, reach = 0.5, 0.45, 0.3
+    landmarks[POSE_ROWS] = [center_x, center_y, 0.0, 0.2]
+    landmarks[mp_pose.PoseLandmark.NOSE] = [center_x, center_y - 0.1, 0.0, 0.9]
+    landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER] = [center_x - 0.06, center_y + 0.05, 0.0, 0.9]
+    landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER] = [center_x + 0.06, center_y + 0.05, 0.0, 0.9]
+    body_center_y = center_y - 0.025  # see get_body_center
+
+    # right hand = holistic left_hand / LEFT_WRIST (see game/vision/landmarks.py)
+    for wrist, hand_rows, octant in ((mp_pose.PoseLandmark.LEFT_WRIST, LEFT_HAND_ROWS, right_octant),
+                                     (mp_pose.PoseLandmark.RIGHT_WRIST, RIGHT_HAND_ROWS, left_octant)):
+        if octant < 0:
+            continue
+        angle = np.radians(octant * OCTANT_WIDTH + rng.normal(0.0, angle_noise))
+        hand_x = center_x + reach * np.cos(angle) / aspect_ratio  # same angle in pixels
+        hand_y = body_center_y + reach * np.sin(angle)
+        landmarks[wrist] = [hand_x, hand_y, 0.0, 0.9]
+        landmarks[hand_rows, :2] = [hand_x, hand_y] + rng.normal(0.0, 0.01, (HAND_LANDMARK_COUNT, 2))
+        landmarks[hand_rows, 2:] = [0.0, 1.0]
+    return landmarks
+
+
+@register_backend("mock")
+class MockBackend(RecognitionBackend):
+    """No model: synthetic landmarks of a player signing letters (zero cost, for headless runs and tests).
+
+    - script: symbols signed in turn, each held for hold_time seconds ("" = hands down), e.g. "HELLO"
+    - keyboard=True: signs the letter whose key is held down (the game's shortcut keys still apply),
+      always runs in the game process (the inference process has no pygame display to read the keys from)
+    """
+
+    SUPPORTS_ROI = False  # synthetic landmarks are relative to the full frame, not to the crop they are given
+    GAME_PROCESS_PARAMS = ('keyboard',)
+
+    def __init__(self, script="", hold_time=1.0, keyboard=False, angle_noise=3.0, seed=0):
+        # built from the mapping files, not imported from the assets (they need a display, the inference
+        # process has none)
+        self.alphabet = SemaphoreAlphabet(load_semaphores_mapping())
+        self.script = script
+        self.hold_time = hold_time
+        self.keyboard = keyboard
+        self.angle_noise = angle_noise
+        self.rng = np.random.default_rng(seed)
+        self.start_time = time.perf_counter()
+        if keyboard:
+            import pygame
+            self.letter_keys = [(pygame.key.key_code(letter.lower()), letter) for letter in string.ascii_uppercase]
+
+    def current_symbol(self):
+        if self.keyboard:
+            import pygame
+            pressed = pygame.key.get_pressed()
+            for key, letter in self.letter_keys:
+                if pressed[key]:
+                    return letter
+        if self.script:
+            index = int((time.perf_counter() - self.start_time) / self.hold_time) % len(self.script)
+            return self.script[index].upper()
+        return None
+
+    def process(self, rgb_image):
+        """Returns the landmarks array for an RGB image"""
+        octants = self.alphabet.get_octants(self.current_symbol()) or (-1, -1)
+        image_height, image_width = rgb_image.shape[:2]
+        return player_landmarks(*octants, image_width / image_height, self.angle_noise, self.rng)
+
+
+@register_backend("markers")
+class ColorMarkerBackend(RecognitionBackend):
+    """No model: tracks two coloured flags or gloves (one colour per hand, see game/vision/markers.py) with HSV
+    thresholding and contour moments, cheap enough for the camera rate on a single low power core.
+
+    The markers are the wrists of the landmarks array, the body center is either the calibrated fixed point
+    (body_center="fixed", the player stands where they were calibrated) or found below the face by a Haar
+    cascade (body_center="face", every face_interval frames). Calibrate with WebcamPanel.calibrate_markers().
+    """
+
+    SUPPORTS_ROI = False
+
+    def __init__(self, calibration_path=MARKER_CALIBRATION_PATH, processing_width=160, min_area=0.0005,
+                 body_center="fixed", face_cascade_path=None, face_interval=10):
+        self.calibration_path = calibration_path
+        self.processing_width = processing_width  # the image is downscaled to this width first
+        self.min_area = min_area  # smallest marker, fraction of the image area
+        self.face_detector = FaceDetector(face_cascade_path) if body_center == "face" else None
+        self.face_interval = face_interval
+        self.frame_count = 0
+        self.kernel = np.ones((3, 3), dtype=np.uint8)
+        self.set_calibration(load_marker_calibration(calibration_path))
+
+    def set_calibration(self, calibration):
+        self.colors = calibration['markers']
+        self.body_center = tuple(calibration['body_center'])
+
+    def process(self, rgb_image):
+        """Returns the landmarks array for an RGB image"""
+        image_height, image_width = rgb_image.shape[:2]
+        if image_width > self.processing_width:
+            scale = self.processing_width / image_width
+            small = cv2.resize(rgb_image, (self.processing_width, int(image_height * scale)),
+                               interpolation=cv2.INTER_NEAREST)
+        else:
+            small = rgb_image
+        hsv_image = cv2.cvtColor(small, cv2.COLOR_RGB2HSV)
+
+        if self.face_detector and self.frame_count % self.face_interval == 0:
+            # the body moves little between two detections, the last center is kept when the face is lost
+            self.body_center = self.face_detector.body_center(cv2.cvtColor(rgb_image, cv2.COLOR_RGB2GRAY)) \
+                or self.body_center
+        self.frame_count += 1
+
+        # body center = shoulder midpoint, Y averaged with the nose (see get_body_center)
+        landmarks = empty_landmarks()
+        center_x, center_y = self.body_center
+        landmarks[mp_pose.PoseLandmark.NOSE] = [center_x, center_y, 0.0, 0.9]
+        landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER] = [center_x + 0.05, center_y, 0.0, 0.9]
+        landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER] = [center_x - 0.05, center_y, 0.0, 0.9]
+
+        # right hand = holistic left_hand / LEFT_WRIST (see game/vision/landmarks.py)
+        for marker, wrist in (('right_hand', mp_pose.PoseLandmark.LEFT_WRIST),
+                              ('left_hand', mp_pose.PoseLandmark.RIGHT_WRIST)):
+            mask = cv2.morphologyEx(marker_mask(hsv_image, self.colors[marker]), cv2.MORPH_OPEN, self.kernel)
+            position = find_marker(mask, self.min_area)
+            if position is not None:
+                landmarks[wrist] = [position[0], position[1], 0.0, 0.9]
+        return landmarks
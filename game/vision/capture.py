@@ -0,0 +1,91 @@
+import threading
+import time
+
+import cv2
+
+
+class ThreadedCapture:
+    """Reads camera frames on a background thread into a single latest-frame slot.
+
+    The main loop never waits on the camera: read() returns immediately with the
+    newest frame delivered so far, older frames are simply overwritten (dropped).
+    """
+
+    def __init__(self, device=0, width=None, height=None, fourcc=None, fps=None, buffer_size=1):
+        self.cap = cv2.VideoCapture(device)
+        # Settings asked to the driver (None = driver default) and settings it actually granted
+        self.requested = {'width': width, 'height': height, 'fourcc': fourcc, 'fps': fps, 'buffer_size': buffer_size}
+        self.granted = self.configure(**self.requested)
+
+        # Latest-frame slot (guarded by the lock)
+        self.lock = threading.Lock()
+        self.frame = None
+        self.timestamp = 0.0
+        self.seq = 0             # incremented for every frame delivered by the camera
+        self.dropped_frames = 0  # frames overwritten before anyone read them
+        self.last_read_seq = 0
+
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="webcam-capture", daemon=True)
+        self.thread.start()
+
+    def configure(self, width=None, height=None, fourcc=None, fps=None, buffer_size=None):
+        """Requests a capture format (before the first read) and returns the settings the driver granted,
+        None if the camera could not be opened.
+        fourcc: "MJPG" (compressed, less USB bandwidth at high resolutions) or a raw format such as "YUYV".
+        buffer_size: frames queued by the driver, 1 = always the newest frame (not supported by every backend).
+        """
+        if not self.cap.isOpened():
+            return None
+        # The format goes first: the available resolutions and frame rates depend on it
+        if fourcc:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        if width:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        if height:
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        if fps:
+            self.cap.set(cv2.CAP_PROP_FPS, fps)
+        if buffer_size:
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+
+        fourcc_code = int(self.cap.get(cv2.CAP_PROP_FOURCC))
+        return {
+            'width': int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fourcc': "".join(chr((fourcc_code >> 8 * i) & 0xFF) for i in range(4)),
+            'fps': self.cap.get(cv2.CAP_PROP_FPS),
+            'buffer_size': int(self.cap.get(cv2.CAP_PROP_BUFFERSIZE)),
+            'backend': self.cap.getBackendName(),
+        }
+
+    def _run(self):
+        while self.running:
+            ret, frame = self.cap.read()  # blocks until the camera delivers
+            if not ret:
+                # camera unplugged / not available: don't spin at 100% CPU
+                time.sleep(0.01)
+                continue
+            timestamp = time.perf_counter()
+            with self.lock:
+                if self.seq != self.last_read_seq:
+                    self.dropped_frames += 1
+                self.frame = frame
+                self.timestamp = timestamp
+                self.seq += 1
+        # released here, never while cap.read() may still be running (some backends crash)
+        self.cap.release()
+
+    def read(self):
+        """Non-blocking. Returns (frame, capture timestamp, sequence number).
+        frame is None until the camera has delivered its first frame.
+        The same frame is returned again (same seq) if no new frame arrived since the last call.
+        """
+        with self.lock:
+            self.last_read_seq = self.seq
+            return self.frame, self.timestamp, self.seq
+
+    def release(self):
+        """Stops the capture thread, which releases the camera once its current read() returns"""
+        self.running = False
+        self.thread.join(timeout=1.0)
@@ -0,0 +1,36 @@
+import numpy as np
+
+from game.vision.landmarks import BODY_CENTER, RIGHT_HAND
+
+# Octant index -> hand position, octant i is centered on i * 45 degrees (0 = Right, clockwise since y points down)
+HAND_POSITIONS = ('Right', 'Low_Right', 'Down', 'Low_Left', 'Left', 'High_Left', 'Up', 'High_Right')
+POSITION_OCTANTS = {position: octant for octant, position in enumerate(HAND_POSITIONS)}
+
+OCTANT_WIDTH = 45.0
+
+
+def get_hand_angles(points):
+    """Angles (degrees, in ]-180, 180]) of both hands around the body center, NaN if a point is missing"""
+    vectors = points[RIGHT_HAND:] - points[BODY_CENTER]
+    return np.degrees(np.arctan2(vectors[:, 1], vectors[:, 0]))
+
+def classify_octants(points, previous_octants=None, hysteresis=0.0):
+    """Octant index of (right hand, left hand) for a tracked points array, -1 where a point is missing.
+    Both hands are classified at once: one arctan2, then the angle is binned into the 8 octants.
+    With previous_octants, a hand stays in its previous octant until it is more than `hysteresis` degrees
+    past the octant boundary (no flickering between two neighbours when the arm is on a boundary).
+    """
+    angles = get_hand_angles(points)
+    found = ~np.isnan(angles)
+    # octant boundaries at 22.5 + k * 45 degrees, an angle on a boundary goes to the lower octant
+    octants = np.ceil((np.where(found, angles, 0.0) - OCTANT_WIDTH / 2) / OCTANT_WIDTH).astype(int) % 8
+    if previous_octants is not None:
+        # angular distance to the center of the previous octant, in [0, 180]
+        distances = np.abs((np.where(found, angles, 0.0) - previous_octants * OCTANT_WIDTH + 180) % 360 - 180)
+        keep = (previous_octants >= 0) & (distances <= OCTANT_WIDTH / 2 + hysteresis)
+        octants = np.where(keep, previous_octants, octants)
+    return np.where(found, octants, -1)
+
+def get_hand_positions(octants):
+    """(right hand position, left hand position) names for classify_octants results, None where missing"""
+    return tuple(HAND_POSITIONS[octant] if octant >= 0 else None for octant in octants)
@@ -0,0 +1,246 @@
+import multiprocessing
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from game.vision.backends import create_backend
+from game.vision.roi import RoiTracker, process_bgr
+
+# The worker never forks the game process (SDL, the capture thread and a mediapipe graph may be running in it,
+# which is not fork safe): "forkserver" forks it from a clean server process that already imported this module
+# (fast restarts), "spawn" starts a fresh interpreter where there is no forkserver (Windows).
+# Either way the worker imports the game's main module again: main.py only runs the game under its __main__ guard.
+if "forkserver" in multiprocessing.get_all_start_methods():
+    MP_CONTEXT = multiprocessing.get_context("forkserver")
+    MP_CONTEXT.set_forkserver_preload([__name__])
+else:
+    MP_CONTEXT = multiprocessing.get_context("spawn")
+
+
+def _inference_worker_main(shm_name, slot_count, frame_shape, backend_name, backend_params, roi_params,
+                           request_queue, result_queue):
+    """Worker process: runs the recognition backend on the frames written by the game in the shared memory ring buffer.
+    Requests are (slot, seq, timestamp), results are
+    (slot, seq, timestamp, landmarks array or None, confidence, inference time in seconds),
+    or ("error", message) when the backend could not be created.
+    A dict request updates the region of interest tracker settings (e.g. {'roi_inference_size': 192}).
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    frames = np.ndarray((slot_count, *frame_shape), dtype=np.uint8, buffer=shm.buf)
+    try:
+        backend = create_backend(backend_name, **backend_params)
+    except (OSError, RuntimeError) as error:
+        # e.g. a model that mediapipe must download first, without network: reported to the game
+        result_queue.put(("error", repr(error)))
+        del frames
+        shm.close()
+        return
+    roi_tracker = RoiTracker(**roi_params) if roi_params is not None else None
+    try:
+        running = True
+        while running:
+            request = request_queue.get()
+            if request is None:
+                break
+            if isinstance(request, dict):
+                _apply_roi_settings(roi_tracker, request)
+                continue
+            # Only the newest pending frame is worth processing, hand the older slots straight back
+            while True:
+                try:
+                    newer_request = request_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if newer_request is None:
+                    running = False
+                    break
+                if isinstance(newer_request, dict):
+                    _apply_roi_settings(roi_tracker, newer_request)
+                    continue
+                result_queue.put((*request, None, 0.0, 0.0))
+                request = newer_request
+
+            slot, seq, timestamp = request
+            start = time.perf_counter()
+            if roi_tracker:
+                landmarks, confidence = roi_tracker.process(backend, frames[slot])
+            else:
+                landmarks, confidence = process_bgr(backend, frames[slot])
+            result_queue.put((slot, seq, timestamp, landmarks, confidence, time.perf_counter() - start))
+    finally:
+        backend.close()
+        del frames
+        shm.close()
+
+def _apply_roi_settings(roi_tracker, settings):
+    if roi_tracker:
+        for name, value in settings.items():
+            setattr(roi_tracker, name, value)
+
+
+class InferenceWorker:
+    """Runs the landmark inference in a separate process, so that it uses another core than the rendering.
+
+    Frames go through a shared memory ring buffer of `slot_count` frames (no pickling), only the compact
+    landmarks arrays come back. submit() and latest() never block: if every slot is still in use the
+    frame is dropped, and latest() always returns the most recent result received so far.
+    """
+
+    def __init__(self, backend_name="holistic", backend_params=None, roi_params=None, slot_count=3, max_crashes=3):
+        self.backend_name = backend_name
+        self.backend_params = backend_params or {}
+        self.previous_backend_params = self.backend_params  # restored if the worker can't load the new ones
+        self.failed_backend_params = []  # parameters the worker could not load, not tried again
+        self.roi_params = roi_params  # None: no region of interest tracking
+        self.slot_count = slot_count
+        self.max_crashes = max_crashes  # crashes in a row (without a result in between) before giving up
+        self.crash_count = 0
+
+        self.frame_shape = None
+        self.shm = None
+        self.frames = None
+        self.process = None
+        self.request_queue = None
+        self.result_queue = None
+        self.free_slots = []
+
+        self.last_submitted_seq = -1
+        self.latest_seq = -1
+        self.latest_timestamp = 0.0
+        self.latest_landmarks = None
+        self.latest_confidence = 0.0
+        self.inference_times = []  # seconds, of the results received since the last take_inference_times()
+
+    def _start(self, frame_shape):
+        self.frame_shape = frame_shape
+        frame_size = int(np.prod(frame_shape))
+        self.shm = shared_memory.SharedMemory(create=True, size=self.slot_count * frame_size)
+        self.frames = np.ndarray((self.slot_count, *frame_shape), dtype=np.uint8, buffer=self.shm.buf)
+        self.free_slots = list(range(self.slot_count))
+
+        self.request_queue = MP_CONTEXT.Queue()
+        self.result_queue = MP_CONTEXT.Queue()
+        self.process = MP_CONTEXT.Process(
+            target=_inference_worker_main,
+            args=(self.shm.name, self.slot_count, frame_shape, self.backend_name, self.backend_params,
+                  self.roi_params, self.request_queue, self.result_queue),
+            name="landmark-inference",
+            daemon=True
+        )
+        self.process.start()
+
+    def _stop(self):
+        if self.process is None:
+            return
+        self.request_queue.put(None)
+        self.process.join(timeout=2.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process = None
+        self.last_submitted_seq = self.latest_seq  # the frames still in the worker are lost
+        self.request_queue.close()
+        self.result_queue.close()
+        self.frames = None
+        self.shm.close()
+        self.shm.unlink()
+        self.shm = None
+
+    def _collect_results(self):
+        while self.process is not None:
+            try:
+                result = self.result_queue.get_nowait()
+            except queue.Empty:
+                if not self.process.is_alive():
+                    self._process_exited()
+                break
+            if result[0] == "error":
+                message = f"Inference process could not load the {self.backend_name} backend with {self.backend_params}: {result[1]}"
+                if self.backend_params == self.previous_backend_params:
+                    # the configured parameters themselves: nothing to go back to (like a failed in-process backend)
+                    self._stop()
+                    raise RuntimeError(message)
+                print(f"{message}, restarting with {self.previous_backend_params}")
+                self.failed_backend_params.append(self.backend_params)
+                self.backend_params = self.previous_backend_params
+                self._stop()
+                self.frame_shape = None
+                break
+            slot, seq, timestamp, landmarks, confidence, inference_time = result
+            self.free_slots.append(slot)
+            if landmarks is not None:
+                self.inference_times.append(inference_time)
+                self.crash_count = 0
+            if landmarks is not None and seq > self.latest_seq:
+                self.latest_seq = seq
+                self.latest_timestamp = timestamp
+                self.latest_landmarks = landmarks
+                self.latest_confidence = confidence
+
+    def _process_exited(self):
+        """The worker died without reporting an error (e.g. an exception in the backend): it restarts on the
+        next frame, unless it already died max_crashes times in a row without a result
+        """
+        self.crash_count += 1
+        message = f"Inference process exited unexpectedly (exit code {self.process.exitcode})"
+        self._stop()
+        self.frame_shape = None
+        if self.crash_count >= self.max_crashes:
+            raise RuntimeError(f"{message}, {self.crash_count} times in a row")
+        print(f"{message}, restarting")
+
+    def submit(self, frame, seq, timestamp):
+        """Hands a BGR frame to the worker. Returns False if the frame was dropped (worker busy / same frame)."""
+        if frame.shape != self.frame_shape:
+            # first frame, or the camera resolution changed
+            self._stop()
+            self._start(frame.shape)
+        self._collect_results()
+        if self.process is None:
+            return False  # the worker could not load the backend, restarts on the next frame
+        if seq == self.last_submitted_seq or not self.free_slots:
+            return False
+        slot = self.free_slots.pop()
+        np.copyto(self.frames[slot], frame)
+        self.request_queue.put((slot, seq, timestamp))
+        self.last_submitted_seq = seq
+        return True
+
+    def latest(self):
+        """Returns (landmarks, confidence, seq, timestamp) of the newest inference result
+        (landmarks is None before the first one)
+        """
+        self._collect_results()
+        return self.latest_landmarks, self.latest_confidence, self.latest_seq, self.latest_timestamp
+
+    def take_inference_times(self):
+        """Durations (seconds) of the inferences received since the last call, measured in the worker"""
+        inference_times, self.inference_times = self.inference_times, []
+        return inference_times
+
+    def set_roi_settings(self, **settings):
+        """Changes RoiTracker attributes (e.g. roi_inference_size) in the worker, without restarting it"""
+        if self.roi_params is None:
+            return
+        self.roi_params = {**self.roi_params, **settings}
+        if self.process is not None:
+            self.request_queue.put(settings)
+
+    def set_backend_params(self, backend_params):
+        """Changes the backend parameters: the worker restarts (loads the models again) on the next frame.
+        Parameters the worker already failed to load are ignored
+        """
+        if backend_params == self.backend_params or backend_params in self.failed_backend_params:
+            return
+        self.previous_backend_params = self.backend_params
+        self.backend_params = backend_params
+        self.restart()
+
+    def restart(self):
+        """Stops the worker, it starts again (creates the backend again) on the next frame"""
+        self._stop()
+        self.frame_shape = None
+
+    def close(self):
+        self._stop()
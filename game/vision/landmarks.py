@@ -0,0 +1,112 @@
+import numpy as np
+import cv2
+import mediapipe as mp
+
+mp_pose = mp.solutions.pose
+
+# --- Compact landmark layout ---
+# All the landmarks of one frame are stored in a single float32 array of shape (LANDMARK_COUNT, 4)
+# with columns (x, y, z, visibility). x and y are normalized to the frame size (like mediapipe).
+# Rows of a body part that was not detected are NaN.
+POSE_LANDMARK_COUNT = 33
+HAND_LANDMARK_COUNT = 21
+
+POSE_ROWS = slice(0, POSE_LANDMARK_COUNT)
+LEFT_HAND_ROWS = slice(POSE_ROWS.stop, POSE_ROWS.stop + HAND_LANDMARK_COUNT)  # holistic "left_hand_landmarks"
+RIGHT_HAND_ROWS = slice(LEFT_HAND_ROWS.stop, LEFT_HAND_ROWS.stop + HAND_LANDMARK_COUNT)  # holistic "right_hand_landmarks"
+
+LANDMARK_COUNT = RIGHT_HAND_ROWS.stop
+
+# --- Tracked points ---
+# The semaphore only needs 3 points, stored as a (3, 2) array of (x, y), NaN when not found:
+# body center, right hand (screen left, holistic "left_hand") and left hand (screen right, holistic "right_hand")
+BODY_CENTER, RIGHT_HAND, LEFT_HAND = 0, 1, 2
+
+_PALM_TOP_IDS = np.array([
+    mp.solutions.hands.HandLandmark.INDEX_FINGER_MCP, mp.solutions.hands.HandLandmark.MIDDLE_FINGER_MCP,
+    mp.solutions.hands.HandLandmark.RING_FINGER_MCP, mp.solutions.hands.HandLandmark.PINKY_MCP,
+])
+# rows of the palm top landmarks of both hands in the landmarks array, shape (2, 4)
+_PALM_TOP_ROWS = np.stack([LEFT_HAND_ROWS.start + _PALM_TOP_IDS, RIGHT_HAND_ROWS.start + _PALM_TOP_IDS])
+_WRIST_ROWS = np.array([mp_pose.PoseLandmark.LEFT_WRIST, mp_pose.PoseLandmark.RIGHT_WRIST])
+# pose landmarks the tracked points are built from
+_CONFIDENCE_ROWS = np.array([
+    mp_pose.PoseLandmark.NOSE, mp_pose.PoseLandmark.LEFT_SHOULDER, mp_pose.PoseLandmark.RIGHT_SHOULDER,
+    mp_pose.PoseLandmark.LEFT_WRIST, mp_pose.PoseLandmark.RIGHT_WRIST,
+])
+
+
+def empty_landmarks():
+    """Landmarks array for a frame where nothing was detected"""
+    return np.full((LANDMARK_COUNT, 4), np.nan, dtype=np.float32)
+
+def is_detected(part_landmarks):
+    """True if the given rows (e.g. landmarks[POSE_ROWS]) hold a detection"""
+    return not np.isnan(part_landmarks[0, 0])
+
+def get_body_center(pose_landmarks):
+    """Normalized (x, y) body center: shoulder midpoint, with its Y averaged with the nose. None if not visible enough"""
+    left_shoulder = pose_landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER]
+    right_shoulder = pose_landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER]
+    nose = pose_landmarks[mp_pose.PoseLandmark.NOSE]
+    # (NaN visibility when no pose was detected also fails these checks)
+    if not (left_shoulder[3] > 0.5 and right_shoulder[3] > 0.5 and nose[3] > 0.5):
+        return None
+    shoulder_mid_x = (left_shoulder[0] + right_shoulder[0]) / 2
+    shoulder_mid_y = (left_shoulder[1] + right_shoulder[1]) / 2
+    return (shoulder_mid_x, (shoulder_mid_y + nose[1]) / 2)
+
+def get_confidence(landmarks):
+    """Detection confidence of a landmarks array: lowest visibility of the pose landmarks the semaphore
+    needs (nose, shoulders, wrists), 0 if no pose was detected
+    """
+    return float(np.nan_to_num(landmarks[_CONFIDENCE_ROWS, 3], nan=0.0).min())
+
+def get_tracked_points(landmarks, image_width, image_height):
+    """Tracked points array (see above) in pixels. A hand is the center of its palm top (MCP joints),
+    or the pose wrist when the hand itself was not detected.
+    """
+    points = np.full((3, 2), np.nan)
+    body_center = get_body_center(landmarks[POSE_ROWS])
+    if body_center is not None:
+        points[BODY_CENTER] = body_center
+
+    palms = landmarks[_PALM_TOP_ROWS, :2].mean(axis=1)  # (2, 2), NaN for undetected hands
+    wrists = landmarks[_WRIST_ROWS]
+    wrists_xy = np.where(wrists[:, 3:] > 0.5, wrists[:, :2], np.nan)
+    points[RIGHT_HAND:] = np.where(np.isnan(palms), wrists_xy, palms)
+    return points * (image_width, image_height)
+
+def point_to_tuple(point):
+    """(x, y) int tuple for a tracked point (what cv2 and the logs expect), None if not found"""
+    if np.isnan(point[0]):
+        return None
+    return (int(point[0]), int(point[1]))
+
+def fill_landmarks(landmarks, rows, landmark_list, has_visibility=True):
+    """Copies a mediapipe NormalizedLandmarkList into the given rows of the landmarks array"""
+    if not landmark_list:
+        return
+    landmarks[rows] = [(lm.x, lm.y, lm.z, lm.visibility if has_visibility else 1.0) for lm in landmark_list.landmark]
+
+def holistic_results_to_array(results):
+    """Converts mediapipe Holistic results to the compact landmarks array (face landmarks are dropped)"""
+    landmarks = empty_landmarks()
+    fill_landmarks(landmarks, POSE_ROWS, results.pose_landmarks)
+    # hand landmarks have no visibility score
+    fill_landmarks(landmarks, LEFT_HAND_ROWS, results.left_hand_landmarks, has_visibility=False)
+    fill_landmarks(landmarks, RIGHT_HAND_ROWS, results.right_hand_landmarks, has_visibility=False)
+    return landmarks
+
+def draw_landmarks(frame, part_landmarks, connections, image_width, image_height,
+                   landmark_color=(0, 0, 255), connection_color=(224, 224, 224)):
+    """Draws one body part of a landmarks array (same look as mp_drawing.draw_landmarks)"""
+    # (rows of landmarks that were not found are NaN, and not visible)
+    points = (np.nan_to_num(part_landmarks[:, :2]) * (image_width, image_height)).astype(np.int32).tolist()
+    visible = (part_landmarks[:, 3] >= 0.5).tolist()
+    for start, end in connections:
+        if visible[start] and visible[end]:
+            cv2.line(frame, points[start], points[end], connection_color, 2)
+    for point, is_visible in zip(points, visible):
+        if is_visible:
+            cv2.circle(frame, point, 2, landmark_color, -1)
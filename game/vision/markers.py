@@ -0,0 +1,139 @@
+import json
+import os
+
+import cv2
+import numpy as np
+
+# --- Colour markers ---
+# Two brightly coloured flags (or gloves) of different colours, one per hand, tracked by HSV thresholding.
+# A marker colour is {'hue': [low, high], 'saturation': [low, high], 'value': [low, high]} in OpenCV units
+# (hue 0-179, saturation and value 0-255). A hue range with low > high wraps around 180 (e.g. red).
+
+DEFAULT_MARKER_CALIBRATION = {
+    'markers': {
+        'right_hand': {'hue': [170, 10], 'saturation': [120, 255], 'value': [70, 255]},   # red
+        'left_hand': {'hue': [100, 130], 'saturation': [120, 255], 'value': [70, 255]},   # blue
+    },
+    'body_center': [0.5, 0.45],  # normalized, used as the fixed body center
+}
+
+MARKER_CALIBRATION_PATH = "marker_calibration.json"
+
+# --- Calibration pose ---
+# The player stands facing the camera and holds the markers in front of the chest, inside these boxes
+# (normalized (x0, y0, x1, y1) of the mirrored frame: the right hand is on the screen left)
+CALIBRATION_BOXES = {
+    'right_hand': (0.30, 0.50, 0.40, 0.64),
+    'left_hand': (0.60, 0.50, 0.70, 0.64),
+}
+# body center of a player holding that pose, when no face is found in the calibration frame
+CALIBRATION_BODY_CENTER = (0.5, 0.42)
+
+
+def marker_mask(hsv_image, color):
+    """Binary mask (uint8, 255 = marker colour) of an HSV image"""
+    hue_low, hue_high = color['hue']
+    low = np.array([hue_low, color['saturation'][0], color['value'][0]], dtype=np.uint8)
+    high = np.array([hue_high, color['saturation'][1], color['value'][1]], dtype=np.uint8)
+    if hue_low <= hue_high:
+        return cv2.inRange(hsv_image, low, high)
+    # wrapping hue range: [low, 179] + [0, high]
+    mask = cv2.inRange(hsv_image, low, np.array([179, high[1], high[2]], dtype=np.uint8))
+    return cv2.bitwise_or(mask, cv2.inRange(hsv_image, np.array([0, low[1], low[2]], dtype=np.uint8), high))
+
+def find_marker(mask, min_area):
+    """Normalized (x, y) centroid of the largest blob of a mask (from its contour moments), None if it is
+    smaller than min_area (fraction of the image area)
+    """
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return None
+    moments = max((cv2.moments(contour) for contour in contours), key=lambda m: m['m00'])
+    image_height, image_width = mask.shape
+    if moments['m00'] < min_area * image_width * image_height:
+        return None
+    return (moments['m10'] / moments['m00'] / image_width, moments['m01'] / moments['m00'] / image_height)
+
+
+def sample_marker_color(hsv_pixels, hue_margin=8, saturation_margin=40, value_margin=50, min_saturation=60,
+                        max_hue_spread=20):
+    """Marker colour of the HSV pixels (N, 3) of a calibration box: the marker is the most saturated half of
+    the box, its colour covers the central 90% of those pixels widened by the margins
+    """
+    saturations = hsv_pixels[:, 1]
+    marker_pixels = hsv_pixels[saturations >= max(np.percentile(saturations, 50), min_saturation)]
+    if len(marker_pixels) == 0:
+        marker_pixels = hsv_pixels  # nothing colourful in the box
+
+    hues = marker_pixels[:, 0].astype(np.float64)
+    # circular mean of the hues (hue 0-179 = 0-358 degrees), so a red marker around 0 / 179 works too
+    angles = np.radians(hues * 2.0)
+    center = np.degrees(np.arctan2(np.sin(angles).mean(), np.cos(angles).mean())) / 2.0 % 180.0
+    offsets = (hues - center + 90.0) % 180.0 - 90.0  # hue distance to the center, in [-90, 90)
+    # drops the (background) pixels of another colour
+    same_hue = np.abs(offsets) <= max_hue_spread
+    if same_hue.any():
+        marker_pixels, offsets = marker_pixels[same_hue], offsets[same_hue]
+    low_offset, high_offset = np.percentile(offsets, [5, 95])
+    hue = [int(round(center + low_offset - hue_margin)) % 180, int(round(center + high_offset + hue_margin)) % 180]
+
+    saturation_low, saturation_high = np.percentile(marker_pixels[:, 1], [5, 95])
+    value_low, value_high = np.percentile(marker_pixels[:, 2], [5, 95])
+    return {
+        'hue': hue,
+        'saturation': [int(max(saturation_low - saturation_margin, 0)), int(min(saturation_high + saturation_margin, 255))],
+        'value': [int(max(value_low - value_margin, 0)), int(min(value_high + value_margin, 255))],
+    }
+
+def calibrate_markers(bgr_frame, face_detector=None):
+    """Marker calibration from a (mirrored) frame of the player in the calibration pose (see CALIBRATION_BOXES):
+    marker colours sampled in the boxes, fixed body center from the face if one is found
+    """
+    image_height, image_width = bgr_frame.shape[:2]
+    hsv_image = cv2.cvtColor(bgr_frame, cv2.COLOR_BGR2HSV)
+    markers = {}
+    for marker, (x0, y0, x1, y1) in CALIBRATION_BOXES.items():
+        box = hsv_image[int(y0 * image_height):int(y1 * image_height), int(x0 * image_width):int(x1 * image_width)]
+        markers[marker] = sample_marker_color(box.reshape(-1, 3))
+
+    body_center = None
+    if face_detector:
+        body_center = face_detector.body_center(cv2.cvtColor(bgr_frame, cv2.COLOR_BGR2GRAY))
+    return {'markers': markers, 'body_center': list(body_center or CALIBRATION_BODY_CENTER)}
+
+def load_marker_calibration(path=MARKER_CALIBRATION_PATH):
+    """Marker calibration saved by save_marker_calibration, the default one if there is no file yet"""
+    if not os.path.exists(path):
+        return DEFAULT_MARKER_CALIBRATION
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_marker_calibration(calibration, path=MARKER_CALIBRATION_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(calibration, f, indent=2)
+
+
+class FaceDetector:
+    """Body center below the largest frontal face found by a Haar cascade (no neural model)"""
+
+    def __init__(self, cascade_path=None, detection_width=320, face_offset=0.75):
+        cascade_path = cascade_path or os.path.join(cv2.data.haarcascades, "haarcascade_frontalface_default.xml")
+        self.cascade = cv2.CascadeClassifier(cascade_path)
+        if self.cascade.empty():
+            raise ValueError(f"Could not load the face cascade '{cascade_path}'")
+        self.detection_width = detection_width
+        self.face_offset = face_offset  # body center distance below the face center, in face heights
+
+    def body_center(self, gray_image):
+        """Normalized (x, y) body center, None if no face was found"""
+        image_height, image_width = gray_image.shape
+        if image_width > self.detection_width:
+            scale = self.detection_width / image_width
+            gray_image = cv2.resize(gray_image, (self.detection_width, int(image_height * scale)),
+                                    interpolation=cv2.INTER_AREA)
+        faces = self.cascade.detectMultiScale(gray_image, scaleFactor=1.2, minNeighbors=4)
+        if len(faces) == 0:
+            return None
+        x, y, w, h = max(faces, key=lambda face: face[2] * face[3])
+        detection_height, detection_width = gray_image.shape
+        return ((x + w / 2) / detection_width, (y + h / 2 + self.face_offset * h) / detection_height)
@@ -0,0 +1,44 @@
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """Skips the inference for frames that barely changed since the last inferred frame (player holding a pose).
+
+    Frames are compared as tiny greyscale thumbnails: the inference is needed when more than `min_changed`
+    of the thumbnail pixels changed by more than `pixel_threshold` grey levels, or when the last inferred
+    frame is older than `max_staleness` seconds. Comparing with the last inferred frame (not the previous
+    frame) means a slow movement also ends up triggering an inference.
+    A frame only becomes the reference once accept() confirms it was inferred (the inference process can
+    drop a frame when it is busy).
+    """
+
+    def __init__(self, size=(32, 24), pixel_threshold=20, min_changed=0.005, max_staleness=0.5):
+        self.size = size
+        self.pixel_threshold = pixel_threshold
+        self.min_changed = min_changed
+        self.max_staleness = max_staleness
+
+        self.reference = None  # thumbnail of the last inferred frame
+        self.reference_time = 0.0
+        self.candidate = None  # (thumbnail, timestamp) of the last frame should_infer() let through
+        self.skipped_frames = 0
+
+    def should_infer(self, frame, timestamp):
+        """True if the (BGR) frame captured at `timestamp` needs a new inference"""
+        # linear resize to 4x the thumbnail first (cheap), the area resize then averages 16 samples per pixel
+        small = cv2.resize(frame, (self.size[0] * 4, self.size[1] * 4), interpolation=cv2.INTER_LINEAR)
+        thumbnail = cv2.cvtColor(cv2.resize(small, self.size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        if self.reference is not None and timestamp - self.reference_time < self.max_staleness:
+            changed = np.count_nonzero(cv2.absdiff(thumbnail, self.reference) > self.pixel_threshold)
+            if changed <= self.min_changed * thumbnail.size:
+                self.skipped_frames += 1
+                return False
+        self.candidate = (thumbnail, timestamp)
+        return True
+
+    def accept(self):
+        """The last frame should_infer() let through was inferred: later frames are compared with it"""
+        if self.candidate is not None:
+            self.reference, self.reference_time = self.candidate
+            self.candidate = None
@@ -0,0 +1,68 @@
+import numpy as np
+
+
+class HandMotionModel:
+    """Runs the inference at a reduced, adaptive rate and predicts the tracked points in between.
+
+    The tracked points (body center and both hands, see game/vision/landmarks.py) each follow a constant
+    velocity model (alpha-beta filter). Each inference result corrects the model, every frame gets the
+    smoothed prediction for its own timestamp. The inference rate goes from min_rate (hands still) to
+    max_rate (hands moving at fast_speed frame widths per second or more).
+    A point that is not detected anymore is still predicted for max_prediction_time seconds, then dropped.
+    """
+
+    def __init__(self, min_rate=15.0, max_rate=30.0, fast_speed=1.0, alpha=0.7, beta=0.3, max_prediction_time=0.25):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.fast_speed = fast_speed
+        self.alpha = alpha
+        self.beta = beta
+        self.max_prediction_time = max_prediction_time
+
+        self.rate = max_rate
+        self.last_inference_time = None
+
+        # One row per tracked point (pixels), NaN position = not tracked
+        self.positions = np.full((3, 2), np.nan)
+        self.velocities = np.zeros((3, 2))
+        self.timestamps = np.zeros(3)
+
+    def should_infer(self, timestamp):
+        """True if a new inference is due for a frame captured at `timestamp`"""
+        if self.last_inference_time is not None and timestamp - self.last_inference_time < 1.0 / self.rate:
+            return False
+        self.last_inference_time = timestamp
+        return True
+
+    def correct(self, timestamp, points, image_width):
+        """New inference result (tracked points array of the frame captured at `timestamp`)"""
+        dt = timestamp - self.timestamps
+        found = ~np.isnan(points[:, 0])
+        tracked = ~np.isnan(self.positions[:, 0]) & (dt <= self.max_prediction_time)
+
+        # alpha-beta update of the points still tracked
+        update = found & tracked & (dt > 0)
+        dt_update = dt[update, None]
+        predicted = self.positions[update] + self.velocities[update] * dt_update
+        residuals = points[update] - predicted
+        self.positions[update] = predicted + self.alpha * residuals
+        self.velocities[update] += self.beta * residuals / dt_update
+
+        # (re)start the tracking of new points, drop the points lost for too long
+        restart = found & ~tracked
+        self.positions[restart] = points[restart]
+        self.velocities[restart] = 0.0
+        self.positions[~found & ~tracked] = np.nan
+        self.timestamps[update | restart] = timestamp
+
+        # Adapt the inference rate to the fastest hand
+        hand_speeds = np.linalg.norm(self.velocities[1:], axis=1)[~np.isnan(self.positions[1:, 0])]
+        speed = hand_speeds.max(initial=0.0) / image_width
+        self.rate = self.min_rate + (self.max_rate - self.min_rate) * min(speed / self.fast_speed, 1.0)
+
+    def predict(self, timestamp):
+        """Smoothed tracked points array at `timestamp`"""
+        dt = np.maximum(timestamp - self.timestamps, 0.0)
+        predictions = self.positions + self.velocities * dt[:, None]
+        predictions[dt > self.max_prediction_time] = np.nan
+        return predictions
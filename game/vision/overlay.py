@@ -0,0 +1,55 @@
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+class OctantMaskCache:
+    """Octant wedge masks for the webcam overlays, so tinting an octant doesn't copy and blend the whole frame.
+
+    A mask is the bounding box of the wedge (clipped to the frame) and a uint8 mask inside it. Masks are
+    cached (LRU) by frame size, body center bucket (bucket_size pixels, the wedge is drawn from the bucket
+    center) and octant.
+    """
+
+    def __init__(self, alphabet, bucket_size=4, max_entries=64):
+        self.alphabet = alphabet
+        self.bucket_size = bucket_size
+        self.max_entries = max_entries
+        self.masks = OrderedDict()  # (width, height, bucket x, bucket y, octant) -> (y0, y1, x0, x1, mask) or None
+
+    def get_mask(self, octant, body_center, image_width, image_height):
+        bucket_x, bucket_y = body_center[0] // self.bucket_size, body_center[1] // self.bucket_size
+        key = (image_width, image_height, bucket_x, bucket_y, octant)
+        if key in self.masks:
+            self.masks.move_to_end(key)
+            return self.masks[key]
+
+        center = (bucket_x * self.bucket_size + self.bucket_size // 2, bucket_y * self.bucket_size + self.bucket_size // 2)
+        polygon = self.alphabet.get_octant_polygon(octant, center, image_width, image_height)
+        # only the wedge's bounding box (clipped to the frame) is filled, never a full frame mask
+        x, y, w, h = cv2.boundingRect(polygon)
+        x0, y0, x1, y1 = max(x, 0), max(y, 0), min(x + w, image_width), min(y + h, image_height)
+        if x0 >= x1 or y0 >= y1:
+            entry = None  # wedge entirely outside of the frame
+        else:
+            mask = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+            cv2.fillPoly(mask, [polygon], 1, offset=(-x0, -y0))
+            entry = (y0, y1, x0, x1, mask)
+
+        self.masks[key] = entry
+        if len(self.masks) > self.max_entries:
+            self.masks.popitem(last=False)
+        return entry
+
+    def blend(self, frame, body_center, octant, color, alpha):
+        """Tints the octant around body_center with color (alpha blending), only touching the masked pixels"""
+        image_height, image_width = frame.shape[:2]
+        entry = self.get_mask(octant, body_center, image_width, image_height)
+        if entry is None:
+            return
+        y0, y1, x0, x1, mask = entry
+        region = frame[y0:y1, x0:x1]
+        tinted = cv2.addWeighted(region, 1 - alpha, region, 0, 0)
+        tinted = cv2.add(tinted, (color[0] * alpha, color[1] * alpha, color[2] * alpha, 0))
+        cv2.copyTo(tinted, mask, region)  # writes the masked pixels back into the frame
@@ -0,0 +1,84 @@
+import math
+from collections import deque
+
+import numpy as np
+
+# Inference quality levels, from the configured settings (level 0) to the cheapest. They are relative to the
+# WebcamPanel configuration and never go above it:
+# - inference_scale: scales the configured inference sizes (full frame scan / crop around the player, see roi.py)
+# - max_model_complexity: caps the configured model complexity (COMPLEXITY_PARAMS in backends.py), None = as configured
+# - rate_scale: scales the configured inference rate range of the motion model (see motion_model.py)
+INFERENCE_QUALITY_LEVELS = (
+    {'inference_scale': 1.0, 'max_model_complexity': None, 'rate_scale': 1.0},
+    {'inference_scale': 0.85, 'max_model_complexity': 1, 'rate_scale': 0.8},
+    {'inference_scale': 0.7, 'max_model_complexity': 0, 'rate_scale': 0.67},
+    {'inference_scale': 0.6, 'max_model_complexity': 0, 'rate_scale': 0.5},
+    {'inference_scale': 0.5, 'max_model_complexity': 0, 'rate_scale': 0.33},
+)
+MIN_INFERENCE_SIZE = 96  # pixels, smaller images lose the hands
+
+# Overlay quality levels (drawn in the game loop): "full", or "reduced" (no landmark skeleton, no octant fills)
+OVERLAY_QUALITY_LEVELS = (
+    {'overlays': "full"},
+    {'overlays': "reduced"},
+)
+
+
+def inference_settings(quality, inference_sizes, model_complexity, rates):
+    """Settings of an inference quality level from the configured ones (dicts setting name -> configured value):
+    the inference sizes and rates are scaled, the model complexities capped, none goes above its configured value.
+    Returns (inference_sizes, model_complexity, rates)
+    """
+    cap = quality['max_model_complexity']
+    return (
+        {name: min(size, max(int(size * quality['inference_scale']), MIN_INFERENCE_SIZE))
+         for name, size in inference_sizes.items()},
+        {name: value if cap is None else min(value, cap) for name, value in model_complexity.items()},
+        {name: rate * quality['rate_scale'] for name, rate in rates.items()},
+    )
+
+
+class QualityController:
+    """Steps the quality down when a duration (frame time, inference time) gets too long, and back up when
+    there is room again.
+
+    The statistic is the 90th percentile of the last `window` durations. The quality goes down one level
+    when it exceeds target_time * down_threshold, up one level when it is under target_time * up_threshold.
+    Hysteresis: the gap between both thresholds, plus no change for `cooldown` seconds after a change and a
+    full window of new samples before the next decision.
+    """
+
+    def __init__(self, levels, target_time, window=60, down_threshold=1.1, up_threshold=0.6, cooldown=3.0,
+                 start_level=0):
+        self.levels = levels
+        self.target_time = target_time
+        self.down_threshold = down_threshold
+        self.up_threshold = up_threshold
+        self.cooldown = cooldown
+
+        self.level = start_level
+        self.samples = deque(maxlen=window)
+        self.last_change_time = -math.inf
+        self.decision_time = None  # statistic that triggered the last change
+
+    def statistic(self):
+        """Duration statistic (seconds) over the current window, None without samples"""
+        return float(np.percentile(self.samples, 90)) if self.samples else None
+
+    def update(self, duration, now):
+        """Adds a duration (seconds). Returns the new level index when the quality must change, else None"""
+        self.samples.append(duration)
+        if len(self.samples) < self.samples.maxlen or now - self.last_change_time < self.cooldown:
+            return None
+
+        statistic = self.statistic()
+        if statistic > self.target_time * self.down_threshold and self.level < len(self.levels) - 1:
+            self.level += 1
+        elif statistic < self.target_time * self.up_threshold and self.level > 0:
+            self.level -= 1
+        else:
+            return None
+        self.decision_time = statistic
+        self.samples.clear()
+        self.last_change_time = now
+        return self.level
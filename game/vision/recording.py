@@ -0,0 +1,66 @@
+import os
+
+import numpy as np
+
+from game.vision.landmarks import LANDMARK_COUNT
+
+# --- Landmark recording format ---
+# A header (magic, landmark count, record size) followed by fixed size records, one per WebcamPanel update,
+# holding the inference output exactly as the classification stage received it. The records can be read
+# back with np.memmap (see load_landmark_recording) without parsing anything.
+LANDMARK_RECORD_DTYPE = np.dtype([
+    ('frame_seq', '<u8'),
+    ('frame_timestamp', '<f8'),      # capture timestamp of the frame
+    ('landmarks_timestamp', '<f8'),  # capture timestamp of the frame the landmarks come from
+    ('new_landmarks', '?'),          # False when the landmarks were already used for a previous frame
+    ('image_size', '<u2', (2,)),     # (width, height) of the frame
+    ('landmarks', '<f4', (LANDMARK_COUNT, 4)),
+])
+RECORDING_MAGIC = b"SEMLMK01"
+RECORDING_HEADER_DTYPE = np.dtype([('magic', 'S8'), ('landmark_count', '<u4'), ('record_size', '<u4')])
+
+
+class LandmarkRecorder:
+    """Appends the landmarks of every frame to a binary recording file, flushed every flush_interval records
+    (the game is often killed rather than closed: at most the last flush_interval records are lost)
+    """
+
+    def __init__(self, filepath, flush_interval=30):
+        self.file = open(filepath, "wb")
+        self.flush_interval = flush_interval
+        header = np.array((RECORDING_MAGIC, LANDMARK_COUNT, LANDMARK_RECORD_DTYPE.itemsize), dtype=RECORDING_HEADER_DTYPE)
+        self.file.write(header.tobytes())
+        self.record_buffer = np.zeros((), dtype=LANDMARK_RECORD_DTYPE)  # reused for every record
+        self.record_count = 0
+
+    def record(self, frame_seq, frame_timestamp, landmarks_timestamp, new_landmarks, image_width, image_height,
+               landmarks):
+        record = self.record_buffer
+        record['frame_seq'] = frame_seq
+        record['frame_timestamp'] = frame_timestamp
+        record['landmarks_timestamp'] = landmarks_timestamp
+        record['new_landmarks'] = new_landmarks
+        record['image_size'] = (image_width, image_height)
+        record['landmarks'] = landmarks
+        self.file.write(record.tobytes())
+        self.record_count += 1
+        if self.record_count % self.flush_interval == 0:
+            self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def load_landmark_recording(filepath):
+    """Memory maps the records of a landmark recording (read only structured array, LANDMARK_RECORD_DTYPE)"""
+    header = np.fromfile(filepath, dtype=RECORDING_HEADER_DTYPE, count=1)
+    if len(header) == 0 or header['magic'][0] != RECORDING_MAGIC:
+        raise ValueError(f"'{filepath}' is not a landmark recording")
+    if header['landmark_count'][0] != LANDMARK_COUNT or header['record_size'][0] != LANDMARK_RECORD_DTYPE.itemsize:
+        raise ValueError(f"'{filepath}' was recorded with a different landmark layout")
+    # a killed recorder can leave a partial record at the end: only the complete records are mapped
+    record_count = (os.path.getsize(filepath) - RECORDING_HEADER_DTYPE.itemsize) // LANDMARK_RECORD_DTYPE.itemsize
+    if record_count == 0:
+        return np.zeros(0, dtype=LANDMARK_RECORD_DTYPE)  # np.memmap can't map an empty recording
+    return np.memmap(filepath, dtype=LANDMARK_RECORD_DTYPE, mode='r', offset=RECORDING_HEADER_DTYPE.itemsize,
+                     shape=(record_count,))
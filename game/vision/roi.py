@@ -0,0 +1,96 @@
+import cv2
+import numpy as np
+import mediapipe as mp
+
+from game.vision.landmarks import POSE_ROWS, LEFT_HAND_ROWS, RIGHT_HAND_ROWS, get_body_center
+
+mp_pose = mp.solutions.pose
+
+# Pose landmarks the semaphore recognition depends on (must stay inside the region of interest)
+TRACKED_POSE_IDS = [
+    mp_pose.PoseLandmark.NOSE,
+    mp_pose.PoseLandmark.LEFT_SHOULDER, mp_pose.PoseLandmark.RIGHT_SHOULDER,
+    mp_pose.PoseLandmark.LEFT_WRIST, mp_pose.PoseLandmark.RIGHT_WRIST,
+]
+
+
+def process_bgr(backend, frame, inference_size=None):
+    """Runs the backend on a BGR frame, downscaled first so its longest side is at most inference_size.
+    Returns (landmarks, detection confidence), see RecognitionBackend.detect.
+    The landmarks are normalized, so the downscale doesn't change them.
+    """
+    height, width = frame.shape[:2]
+    if inference_size and max(width, height) > inference_size:
+        scale = inference_size / max(width, height)
+        frame = cv2.resize(frame, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+    rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    rgb_image.flags.writeable = False
+    return backend.detect(rgb_image)
+
+
+class RoiTracker:
+    """Crops the frame around the player before inference, using the landmarks found in the previous frame.
+
+    The crop is a square centered on the body center, big enough to contain the hands at arm's length.
+    It is downscaled to roi_inference_size, the landmarks are mapped back to full frame coordinates.
+    When the player is lost, the next frame is a full frame scan (downscaled to full_inference_size).
+    """
+
+    def __init__(self, roi_inference_size=256, full_inference_size=480, margin=0.3, min_reach=2.5):
+        self.roi_inference_size = roi_inference_size
+        self.full_inference_size = full_inference_size
+        self.margin = margin          # extra space around the tracked landmarks (fraction of the radius)
+        self.min_reach = min_reach    # minimum crop radius, in shoulder widths (room for an extended arm)
+
+        self.roi = None  # (x0, y0, x1, y1) in pixels, None = full frame scan
+
+    def process(self, backend, frame):
+        """Runs the backend on the region of interest of a BGR frame.
+        Returns (landmarks normalized to the full frame, detection confidence)
+        """
+        image_height, image_width = frame.shape[:2]
+        if self.roi is None:
+            landmarks, confidence = process_bgr(backend, frame, self.full_inference_size)
+        else:
+            x0, y0, x1, y1 = self.roi
+            landmarks, confidence = process_bgr(backend, frame[y0:y1, x0:x1], self.roi_inference_size)
+            # crop coordinates -> full frame coordinates (z uses the same scale as x)
+            landmarks[:, 0] = (landmarks[:, 0] * (x1 - x0) + x0) / image_width
+            landmarks[:, 1] = (landmarks[:, 1] * (y1 - y0) + y0) / image_height
+            landmarks[:, 2] *= (x1 - x0) / image_width
+        self.update(landmarks, image_width, image_height)
+        return landmarks, confidence
+
+    def update(self, landmarks, image_width, image_height):
+        """Computes the region of interest for the next frame from this frame's landmarks"""
+        pose_landmarks = landmarks[POSE_ROWS]
+        body_center = get_body_center(pose_landmarks)
+        if body_center is None:
+            self.roi = None  # tracking lost
+            return
+
+        scale = np.array([image_width, image_height])
+        center = np.array(body_center) * scale
+
+        tracked = pose_landmarks[TRACKED_POSE_IDS]
+        points = np.concatenate([
+            tracked[tracked[:, 3] > 0.5, :2],
+            landmarks[LEFT_HAND_ROWS, :2],
+            landmarks[RIGHT_HAND_ROWS, :2],
+        ])
+        points = points[~np.isnan(points[:, 0])] * scale
+
+        left_shoulder = pose_landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER, :2] * scale
+        right_shoulder = pose_landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER, :2] * scale
+        shoulder_width = np.linalg.norm(left_shoulder - right_shoulder)
+
+        radius = max(np.abs(points - center).max(), shoulder_width * self.min_reach) * (1 + self.margin)
+
+        x0, y0 = np.maximum(center - radius, 0).astype(int).tolist()
+        x1, y1 = np.minimum(center + radius, scale).astype(int).tolist()
+        if (x1 - x0) * (y1 - y0) > 0.8 * image_width * image_height:
+            self.roi = None  # player fills the frame: a crop wouldn't save anything
+        elif x1 - x0 < 16 or y1 - y0 < 16:
+            self.roi = None  # body center at the edge of the frame, nothing sensible to crop
+        else:
+            self.roi = (x0, y0, x1, y1)
@@ -0,0 +1,233 @@
+import os
+import time
+
+import cv2
+import numpy as np
+
+from game.vision.capture import ThreadedCapture
+from game.vision.recording import load_landmark_recording
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+class PlaybackSource:
+    """Frame source replaying recorded frames, with the same read() / release() interface as ThreadedCapture.
+
+    Every frame keeps its original timestamp (seconds from the start of the recording), so a replay
+    feeds the recognition the exact same frames and timestamps every time.
+    - realtime=True: frames are delivered at their recorded rate (times speed), frames the main loop was
+      too slow for are skipped (like a live camera)
+    - realtime=False: every read() returns the next frame, as fast as the main loop goes
+    - loop=True: starts over at the end (timestamps keep increasing), otherwise the last frame is returned
+      again (same seq)
+    """
+
+    def __init__(self, realtime=True, loop=False, speed=1.0):
+        self.realtime = realtime
+        self.loop = loop
+        self.speed = speed
+
+        self.frame = None
+        self.timestamp = 0.0
+        self.seq = 0
+        self.dropped_frames = 0  # frames skipped to keep up with the recorded rate
+
+        self.loop_offset = 0.0   # added to the recorded timestamps after each loop
+        self.pending = None      # next (frame, timestamp), decoded ahead
+        self.start_time = None   # (wall clock, recording time) of the first read, for realtime playback
+
+    def _next_frame(self):
+        """(frame, recorded timestamp) of the next frame, None at the end of the recording"""
+        raise NotImplementedError
+
+    def _rewind(self):
+        raise NotImplementedError
+
+    def _decode(self):
+        entry = self._next_frame()
+        if entry is None and self.loop and self.seq > 0:
+            self._rewind()
+            entry = self._next_frame()
+            if entry is not None:
+                # the first frame comes one frame interval after the last one
+                self.loop_offset = self.timestamp + self.frame_interval() - entry[1]
+        if entry is not None:
+            entry = (entry[0], entry[1] + self.loop_offset)
+        self.pending = entry
+
+    def frame_interval(self):
+        """Time between two recorded frames, used to continue the timestamps after a loop"""
+        return 1.0 / 30.0
+
+    def read(self):
+        """Non-blocking. Returns (frame, original timestamp, sequence number), like ThreadedCapture.read()"""
+        if self.seq == 0 and self.pending is None:
+            self._decode()
+        if self.pending is None:
+            return self.frame, self.timestamp, self.seq
+
+        if not self.realtime:
+            self._advance()
+            return self.frame, self.timestamp, self.seq
+
+        now = time.perf_counter()
+        if self.start_time is None:
+            self.start_time = (now, self.pending[1])
+        recording_time = self.start_time[1] + (now - self.start_time[0]) * self.speed
+        delivered = 0
+        while self.pending is not None and self.pending[1] <= recording_time:
+            self._advance()
+            delivered += 1
+        self.dropped_frames += max(delivered - 1, 0)
+        return self.frame, self.timestamp, self.seq
+
+    def _advance(self):
+        self.frame, self.timestamp = self.pending
+        self.seq += 1
+        self._decode()
+
+    def release(self):
+        pass
+
+
+class VideoFileSource(PlaybackSource):
+    """Frames of a video file, timestamped with the position of each frame in the video"""
+
+    def __init__(self, path, realtime=True, loop=False, speed=1.0):
+        super().__init__(realtime, loop, speed)
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise ValueError(f"Could not open video file '{path}'")
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.index = 0
+
+    def _next_frame(self):
+        ret, frame = self.cap.read()
+        if not ret:
+            return None
+        # fall back to the frame rate when the container has no timestamps
+        timestamp = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0 or self.index / self.fps
+        self.index += 1
+        return frame, timestamp
+
+    def _rewind(self):
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        self.index = 0
+
+    def frame_interval(self):
+        return 1.0 / self.fps
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageSequenceSource(PlaybackSource):
+    """Image files of a directory, in file name order.
+
+    Timestamps are read from a `timestamps.txt` file in the directory (one time in seconds per line,
+    same order as the images) if there is one, otherwise the images are spaced by 1 / fps.
+    """
+
+    def __init__(self, directory, fps=30.0, realtime=True, loop=False, speed=1.0):
+        super().__init__(realtime, loop, speed)
+        self.directory = directory
+        self.fps = fps
+        self.paths = sorted(
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if not self.paths:
+            raise ValueError(f"No images found in '{directory}'")
+
+        timestamps_path = os.path.join(directory, "timestamps.txt")
+        if os.path.exists(timestamps_path):
+            with open(timestamps_path) as f:
+                self.timestamps = [float(line) for line in f if line.strip()]
+            if len(self.timestamps) != len(self.paths):
+                raise ValueError(f"{timestamps_path} has {len(self.timestamps)} timestamps for {len(self.paths)} images")
+        else:
+            self.timestamps = [index / fps for index in range(len(self.paths))]
+        self.index = 0
+
+    def _next_frame(self):
+        if self.index >= len(self.paths):
+            return None
+        frame = cv2.imread(self.paths[self.index])
+        if frame is None:
+            raise ValueError(f"Could not read image '{self.paths[self.index]}'")
+        entry = (frame, self.timestamps[self.index])
+        self.index += 1
+        return entry
+
+    def _rewind(self):
+        self.index = 0
+
+    def frame_interval(self):
+        return 1.0 / self.fps
+
+
+class LandmarkReplaySource(PlaybackSource):
+    """Replays a landmark recording (see game/vision/recording.py) instead of frames: no camera, no model.
+
+    The frames are blank (black) images of the recorded size, already mirrored like the recorded landmarks.
+    WebcamPanel takes the landmarks of the current record (`record`) instead of running the inference.
+    Defaults to realtime=False: records go through the classification stage as fast as the loop allows.
+    """
+
+    provides_landmarks = True
+
+    def __init__(self, path, realtime=False, loop=False, speed=1.0):
+        super().__init__(realtime, loop, speed)
+        self.path = path
+        self.records = load_landmark_recording(path)
+        self.index = 0
+        self.record = None
+        self.blank_frames = {}  # (width, height) -> black frame
+
+    def _next_frame(self):
+        # the "frame" travelling through the playback is the record, read() swaps it for a blank image
+        if self.index >= len(self.records):
+            return None
+        record = self.records[self.index]
+        self.index += 1
+        return record, float(record['frame_timestamp'])
+
+    def _rewind(self):
+        self.index = 0
+
+    def frame_interval(self):
+        if len(self.records) < 2:
+            return 1.0 / 30.0
+        return float(self.records['frame_timestamp'][-1] - self.records['frame_timestamp'][0]) / (len(self.records) - 1)
+
+    def read(self):
+        record, timestamp, seq = super().read()
+        if record is None:
+            return None, timestamp, seq
+        self.record = record
+        size = tuple(record['image_size'].tolist())
+        if size not in self.blank_frames:
+            self.blank_frames[size] = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+        return self.blank_frames[size], timestamp, seq
+
+    def read_landmarks(self):
+        """(landmarks, timestamp of the frame they come from, new landmarks) of the record returned by read()"""
+        record = self.record
+        # shifted like the frame timestamps when looping
+        landmarks_timestamp = float(record['landmarks_timestamp']) + self.timestamp - float(record['frame_timestamp'])
+        return record['landmarks'], landmarks_timestamp, bool(record['new_landmarks'])
+
+
+SOURCES = {
+    "camera": ThreadedCapture,
+    "video": VideoFileSource,
+    "images": ImageSequenceSource,
+    "landmarks": LandmarkReplaySource,
+}
+
+def create_source(name, **params):
+    """Opens the frame source registered under `name` (e.g. create_source("video", path=..., realtime=False))"""
+    if name not in SOURCES:
+        raise ValueError(f"Unknown frame source '{name}' (available: {', '.join(SOURCES)})")
+    return SOURCES[name](**params)
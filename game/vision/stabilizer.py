@@ -0,0 +1,34 @@
+from collections import Counter, deque
+
+import numpy as np
+
+from game.vision.classification import classify_octants
+
+
+class SemaphoreStabilizer:
+    """Turns the per frame classification into a stable semaphore symbol.
+
+    - angular hysteresis: a hand keeps its octant until it is `hysteresis` degrees past the boundary
+    - N-of-M vote: the symbol changes only once a new symbol was seen in `votes` of the last `window` frames,
+      so a confirmed change always takes at least `votes` frames and single frame glitches are ignored
+    update() must be called once per camera frame (a repeated frame would count as another vote).
+    """
+
+    def __init__(self, alphabet, hysteresis=10.0, votes=4, window=6):
+        self.alphabet = alphabet
+        self.hysteresis = hysteresis
+        self.votes = votes
+
+        self.octants = np.array([-1, -1])    # (right, left) octants of the last frame, after hysteresis
+        self.history = deque(maxlen=window)  # symbols of the last frames (before the vote)
+        self.symbol = "NONE"                 # stable symbol
+
+    def update(self, points):
+        """Tracked points array of a new frame. Returns (octants, stable symbol)"""
+        self.octants = classify_octants(points, self.octants, self.hysteresis)
+        self.history.append(self.alphabet.lookup(self.octants))
+
+        candidate, count = Counter(self.history).most_common(1)[0]
+        if candidate != self.symbol and count >= self.votes:
+            self.symbol = candidate
+        return self.octants, self.symbol
@@ -8,131 +8,221 @@ from datetime import datetime
 
 # Screen setup
 SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Alphattack - Hand Semaphore Version")
-clock = pygame.time.Clock()
-
-# --- Import assets and UI components ---
-from assets.assets import BLACK, WHITE, GREEN, BLUE, font, big_font
-from game.UI.status_section import StatusPanel, GAMEOVER_EVENT
-from game.UI.semaphore_detected_section import SEMAPHORE_COMPLETE_EVENT, SemaphorePanel
-from game.UI.bonus_bar_section import BONUSBAR_FULL_EVENT, BonusBar
-from game.UI.webcam_section import WebcamPanel, cap
-from game.gameplay_section import Gameplay
-from game.logger import GameplayLogger
-from game.logger import WebcamLogger
-
-# Initialize loggers
-timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-gameplay_logger = GameplayLogger(f"logs/gameplay_logs_{timestamp}.jsonl")
-webcam_logger = WebcamLogger(f"logs/webcam_logs_{timestamp}.jsonl")
-
-# --- Layout computation ---
-game_col_width = SCREEN_HEIGHT  # Square gameplay area
-ui_col_width = SCREEN_WIDTH - game_col_width
-
-# Row heights
-row4_height = SCREEN_HEIGHT // 2
-row3_height = 20
-remaining_height = SCREEN_HEIGHT - (row4_height + row3_height)
-row1_height = remaining_height // 2
-row2_height = remaining_height - row1_height
-
-# --- Instantiate panels ---
-gameplay_section = Gameplay(pygame.Rect(0, 0, game_col_width, SCREEN_HEIGHT), gameplay_logger)
-status_section = StatusPanel(pygame.Rect(game_col_width, 0, ui_col_width, row1_height), gameplay_logger)
-semaphore_section = SemaphorePanel(pygame.Rect(game_col_width, row1_height, ui_col_width, row2_height))
-bonus_section = BonusBar(pygame.Rect(game_col_width, row1_height + row2_height, ui_col_width, row3_height))
-webcam_section = WebcamPanel(pygame.Rect(game_col_width, row1_height + row2_height + row3_height, ui_col_width, row4_height), webcam_logger)
-
-# Cross-references
-gameplay_section.status_panel = status_section
-gameplay_section.bonus_bar = bonus_section
-gameplay_section.semaphore_panel = semaphore_section
-
-# --- Debug mode ---
-debug_mode = True
-profile_mode = False  # Press P to toggle performance profiling
-
-# --- Main loop ---
-running = True
-frame_times = {}  # Store timing info
-
-while running:
-    loop_start = time.perf_counter()
-    
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-        elif event.type == GAMEOVER_EVENT:
-            gameplay_section.gameover()
-
-        elif event.type == SEMAPHORE_COMPLETE_EVENT:
-            gameplay_section.semaphore_input(event.semaphore)
-
-        elif event.type == BONUSBAR_FULL_EVENT:
-            gameplay_section.bonus_bar_filled()
-
-        elif event.type == pygame.USEREVENT + 10:  # resolve bonus missile
-            gameplay_section.resolve_bonus_event()
-        
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_d:
-                debug_mode = not debug_mode
-                print(f"Debug mode: {'ON' if debug_mode else 'OFF'}")
-            elif event.key == pygame.K_p:
-                profile_mode = not profile_mode
-                print(f"Performance profiling: {'ON' if profile_mode else 'OFF'}")
-
-    # Webcam update
-    t0 = time.perf_counter()
-    frame, detected_semaphore = webcam_section.update()
-    if profile_mode:
-        frame_times['webcam_update'] = time.perf_counter() - t0
-    
-    new_semaphore = detected_semaphore
-    
-    # Update dependent panels
-    t0 = time.perf_counter()
-    semaphore_section.update_semaphore_detected(new_semaphore)
-    bonus_section.update_semaphore_detected(new_semaphore)
-
-    semaphore_section.update()
-    bonus_section.update()
-    gameplay_section.update()
-    if profile_mode:
-        frame_times['updates'] = time.perf_counter() - t0
-
-    # Drawing
-    t0 = time.perf_counter()
-    screen.fill(BLACK)
-    gameplay_section.draw(screen, debug_mode=debug_mode)
-    status_section.draw(screen)
-    semaphore_section.draw(screen)
-    bonus_section.draw(screen)
-    webcam_section.draw(screen, frame, debug_mode=debug_mode)
-
-    pygame.display.flip()
-    if profile_mode:
-        frame_times['draw_flip'] = time.perf_counter() - t0
-    
-    clock.tick(60)
-    
-    # Print timing info periodically when profiling
-    if profile_mode:
-        frame_times['total_loop'] = time.perf_counter() - loop_start
-        if pygame.time.get_ticks() % 1000 < 16:  # Print roughly every second
-            print(f"\n--- Frame Timing (ms) ---")
-            for key, value in frame_times.items():
-                print(f"{key:20s}: {value*1000:6.2f} ms")
-            fps = clock.get_fps()
-            print(f"{'FPS':20s}: {fps:6.1f}")
-            print("-" * 30)
-
-print("Initiating shutdown...")
-webcam_section.close()
-cap.release()
-cv2.destroyAllWindows()
-pygame.quit()
-print("Shutdown complete.")
\ No newline at end of file
+
+
+def main():
+    # (everything runs in main(): the inference worker process imports this module, see
+    # game/vision/inference_worker.py, and must not open a window or start a game)
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Alphattack - Hand Semaphore Version")
+    clock = pygame.time.Clock()
+
+    # --- Import assets and UI components (the assets need the display mode to be set) ---
+    from assets.assets import BLACK, WHITE, GREEN, BLUE, font, big_font
+    from game.UI.status_section import StatusPanel, GAMEOVER_EVENT
+    from game.UI.semaphore_detected_section import SEMAPHORE_COMPLETE_EVENT, SemaphorePanel
+    from game.UI.bonus_bar_section import BONUSBAR_FULL_EVENT, BonusBar
+    from game.UI.webcam_section import WebcamPanel
+    from game.UI.compositor import DirtyRectCompositor
+    from game.fonts import text_cache
+    from game.gameplay_section import Gameplay
+    from game.logger import GameplayLogger
+    from game.logger import WebcamLogger
+
+    # Initialize loggers
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    gameplay_logger = GameplayLogger(f"logs/gameplay_logs_{timestamp}.jsonl")
+    webcam_logger = WebcamLogger(f"logs/webcam_logs_{timestamp}.jsonl")
+
+    # --- Layout computation ---
+    game_col_width = SCREEN_HEIGHT  # Square gameplay area
+    ui_col_width = SCREEN_WIDTH - game_col_width
+
+    # Row heights
+    row4_height = SCREEN_HEIGHT // 2
+    row3_height = 20
+    remaining_height = SCREEN_HEIGHT - (row4_height + row3_height)
+    row1_height = remaining_height // 2
+    row2_height = remaining_height - row1_height
+
+    # --- Instantiate panels ---
+    gameplay_section = Gameplay(pygame.Rect(0, 0, game_col_width, SCREEN_HEIGHT), gameplay_logger)
+    status_section = StatusPanel(pygame.Rect(game_col_width, 0, ui_col_width, row1_height), gameplay_logger)
+    semaphore_section = SemaphorePanel(pygame.Rect(game_col_width, row1_height, ui_col_width, row2_height))
+    bonus_section = BonusBar(pygame.Rect(game_col_width, row1_height + row2_height, ui_col_width, row3_height))
+    webcam_section = WebcamPanel(
+        pygame.Rect(game_col_width, row1_height + row2_height + row3_height, ui_col_width, row4_height),
+        webcam_logger,
+        source="camera",  # or "video" / "images" to replay recorded frames (see game/vision/sources.py)
+        source_params={
+            'device': 0,
+            'width': 640, 'height': 480, # requested capture size (the camera may pick another one, see the logs)
+            'fourcc': "MJPG", # "MJPG" (compressed) or a raw format ("YUYV"), None for the driver default
+            'fps': 30,
+            'buffer_size': 1, # frames queued by the driver (1 = no stale frames)
+            # 'path': "recording.mp4", 'realtime': True, 'loop': False, # "video"
+            # 'directory': "frames/", 'fps': 30.0, 'realtime': True, 'loop': False, # "images"
+            # 'path': "logs/landmarks.bin", 'realtime': False, 'speed': 1.0, # "landmarks"
+        },
+        record_landmarks=None,  # file path to record the landmarks of every frame (replay with source="landmarks")
+        backend="pose_hands",  # "holistic" also runs the (unused) face mesh model, "pose" has no hand model,
+                               # "mock" needs no camera model (e.g. backend_params={'keyboard': True}),
+                               # "markers" tracks two coloured flags / gloves instead (no model, press C to calibrate)
+        backend_params={
+            'pose_model_complexity': 1, # 0, 1 or 2 (lower is faster)
+            'hands_model_complexity': 1, # 0 or 1 (lower is faster)
+        },
+        use_inference_process=True,  # run the landmark inference on another core
+        use_roi_tracking=True,  # crop the frame around the player before inference
+        roi_params={
+            'roi_inference_size': 256, # longest side of the (downscaled) crop around the player
+            'full_inference_size': 480, # longest side of the full frame scan when the player is lost
+        },
+        use_motion_model=True,  # infer at a reduced rate, predict the hands in between
+        motion_params={
+            'min_rate': 15.0, # inferences per second when the hands are still
+            'max_rate': 30.0, # inferences per second when the hands move fast
+        },
+        use_motion_gate=True,  # reuse the last landmarks while the image doesn't change (player holding a pose)
+        motion_gate_params={
+            'pixel_threshold': 20, # grey levels a pixel of the 32x24 thumbnail must change by
+            'min_changed': 0.005, # fraction of changed pixels that triggers an inference
+            'max_staleness': 0.5, # seconds, landmarks are never reused for longer
+        },
+        use_quality_controller=True,  # lower the vision quality when it takes too long (see game/vision/quality.py),
+                                      # never above the settings configured here
+        quality_params={
+            'target_inference_time': 1 / 30, # seconds per inference (keeps up with the camera), sets the inference
+                                             # sizes, model complexity and rates
+            'target_frame_time': 1 / 60, # seconds of work per game loop iteration (60 fps), sets the overlay detail
+        },
+        use_stabilizer=True,  # only change the detected letter once it is stable
+        stabilizer_params={
+            'hysteresis': 10.0, # degrees past an octant boundary before a hand changes octant
+            'votes': 4, # frames (out of window) a new letter must be seen in
+            'window': 6,
+        }
+    )
+
+    # Cross-references
+    gameplay_section.status_panel = status_section
+    gameplay_section.bonus_bar = bonus_section
+    gameplay_section.semaphore_panel = semaphore_section
+
+    # --- Debug mode ---
+    debug_mode = True
+    profile_mode = False  # Press P to toggle performance profiling
+
+    # --- Rendering ---
+    # Only redraw the panels that changed and only send the changed regions to the display
+    # (helps most with software rendered displays, where the full screen flip dominates)
+    dirty_rendering = False
+    compositor = DirtyRectCompositor(screen) if dirty_rendering else None
+
+    # --- Main loop ---
+    running = True
+    frame_times = {}  # Store timing info
+
+    while running:
+        loop_start = time.perf_counter()
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+            elif event.type == GAMEOVER_EVENT:
+                gameplay_section.gameover()
+
+            elif event.type == SEMAPHORE_COMPLETE_EVENT:
+                gameplay_section.semaphore_input(event.semaphore)
+
+            elif event.type == BONUSBAR_FULL_EVENT:
+                gameplay_section.bonus_bar_filled()
+
+            elif event.type == pygame.USEREVENT + 10:  # resolve bonus missile
+                gameplay_section.resolve_bonus_event()
+
+            elif event.type == pygame.VIDEOEXPOSE and compositor:
+                compositor.invalidate()  # the window content must be sent again
+
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_d:
+                    debug_mode = not debug_mode
+                    print(f"Debug mode: {'ON' if debug_mode else 'OFF'}")
+                elif event.key == pygame.K_p:
+                    profile_mode = not profile_mode
+                    print(f"Performance profiling: {'ON' if profile_mode else 'OFF'}")
+                elif event.key == pygame.K_o:
+                    webcam_section.show_overlays = not webcam_section.show_overlays
+                    print(f"Webcam overlays: {'ON' if webcam_section.show_overlays else 'OFF'}")
+                elif event.key == pygame.K_c:
+                    webcam_section.calibrate_markers()
+
+        # Webcam update
+        t0 = time.perf_counter()
+        frame, detected_semaphore = webcam_section.update()
+        if profile_mode:
+            frame_times['webcam_update'] = time.perf_counter() - t0
+
+        new_semaphore = detected_semaphore
+
+        # Update dependent panels
+        t0 = time.perf_counter()
+        semaphore_section.update_semaphore_detected(new_semaphore)
+        bonus_section.update_semaphore_detected(new_semaphore)
+
+        semaphore_section.update()
+        bonus_section.update()
+        gameplay_section.update()
+        if profile_mode:
+            frame_times['updates'] = time.perf_counter() - t0
+
+        # Drawing
+        t0 = time.perf_counter()
+        if compositor:
+            compositor.render([
+                lambda surface, force: gameplay_section.draw_dirty(surface, debug_mode, force),
+                status_section.draw_dirty,
+                semaphore_section.draw_dirty,
+                bonus_section.draw_dirty,
+                lambda surface, force: webcam_section.draw_dirty(surface, frame, debug_mode, force),
+            ])
+        else:
+            screen.fill(BLACK)
+            gameplay_section.draw(screen, debug_mode=debug_mode)
+            status_section.draw(screen)
+            semaphore_section.draw(screen)
+            bonus_section.draw(screen)
+            webcam_section.draw(screen, frame, debug_mode=debug_mode)
+
+            pygame.display.flip()
+        if profile_mode:
+            frame_times['draw_flip'] = time.perf_counter() - t0
+
+        webcam_section.report_frame_time(time.perf_counter() - loop_start)
+        clock.tick(60)
+
+        # Print timing info periodically when profiling
+        if profile_mode:
+            frame_times['total_loop'] = time.perf_counter() - loop_start
+            if pygame.time.get_ticks() % 1000 < 16:  # Print roughly every second
+                print(f"\n--- Frame Timing (ms) ---")
+                for key, value in frame_times.items():
+                    print(f"{key:20s}: {value*1000:6.2f} ms")
+                fps = clock.get_fps()
+                print(f"{'FPS':20s}: {fps:6.1f}")
+                for key, value in webcam_section.vision_stats().items():
+                    print(f"{key:20s}: {value}")
+                print(f"{'text cache':20s}: {text_cache.hits} hits, {text_cache.misses} misses, "
+                      f"{len(text_cache.surfaces)} surfaces")
+                print("-" * 30)
+
+    print("Initiating shutdown...")
+    webcam_section.close()
+    cv2.destroyAllWindows()
+    pygame.quit()
+    print("Shutdown complete.")
+
+
+if __name__ == "__main__":
+    main()